@@ -6,16 +6,36 @@ This script allows you to quickly test your Pololu M3H550 motor controller
 without running the full robot stack.
 """
 
+import re
 import sys
 import time
 import logging
 from pathlib import Path
+from types import MappingProxyType
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from core.motors import MotorController
 
+# Simple configuration for testing (built once, read-only)
+TEST_MOTOR_CONFIG = MappingProxyType({
+    'pololu_m3h550': MappingProxyType({
+        'i2c_bus': 1,                    # Standard I2C bus on Raspberry Pi
+        'i2c_address': 16,               # Default Motoron address (detected at 0x10)
+        'max_speed': 400,                # Conservative speed for testing
+        'motor_1_acceleration': 100,     # Gentle acceleration
+        'motor_1_deceleration': 200,
+        'motor_2_acceleration': 100,
+        'motor_2_deceleration': 200,
+        'motor_3_acceleration': 100,
+        'motor_3_deceleration': 200,
+    })
+})
+
+# One manual control command: "<motor 1-3> <signed speed>"
+MOTOR_CMD_RE = re.compile(r'^\s*([1-3])\s+([+-]?\d{1,4})\s*$')
+
 
 def setup_logging():
     """Setup simple logging for the test"""
@@ -27,6 +47,29 @@ def setup_logging():
     logging.getLogger().setLevel(logging.INFO)
 
 
+def _ensure_i2c_fastmode(bus=1, target_hz=400000):
+    """
+    Warn if the I2C bus runs slower than Fast-mode
+    
+    The Motoron handles 400 kHz; the Pi defaults to 100 kHz, which makes every
+    motor command ~4x slower on the wire. Raise it with
+    dtparam=i2c_arm_baudrate=400000 in /boot/config.txt.
+    """
+    freq_path = Path(f"/sys/class/i2c-adapter/i2c-{bus}/of_node/clock-frequency")
+    try:
+        # Device tree property: 32-bit big-endian integer
+        clock_hz = int.from_bytes(freq_path.read_bytes()[:4], 'big')
+    except OSError:
+        logging.getLogger(__name__).debug(f"Could not read I2C clock from {freq_path}")
+        return
+    
+    if clock_hz < target_hz:
+        logging.getLogger(__name__).warning(
+            f"I2C bus {bus} runs at {clock_hz} Hz; set dtparam=i2c_arm_baudrate={target_hz} "
+            f"in /boot/config.txt for faster motor commands"
+        )
+
+
 def test_motor_controller():
     """Test the motor controller functionality"""
     print("=== Ruohobot M3H550 Motor Test ===")
@@ -34,26 +77,14 @@ def test_motor_controller():
     print("Make sure your robot is secure and motors are safe to run!")
     print()
     
-    # Simple configuration for testing
-    config = {
-        'pololu_m3h550': {
-            'i2c_bus': 1,                    # Standard I2C bus on Raspberry Pi
-            'i2c_address': 16,               # Default Motoron address (detected at 0x10)
-            'max_speed': 400,                # Conservative speed for testing
-            'motor_1_acceleration': 100,     # Gentle acceleration
-            'motor_1_deceleration': 200,
-            'motor_2_acceleration': 100,
-            'motor_2_deceleration': 200,
-            'motor_3_acceleration': 100,
-            'motor_3_deceleration': 200,
-        }
-    }
+    config = TEST_MOTOR_CONFIG
     
     try:
         # Initialize motor controller
         print("Initializing motor controller...")
         mc = MotorController(config)
         print("✓ Motor controller initialized successfully!")
+        _ensure_i2c_fastmode(bus=config['pololu_m3h550']['i2c_bus'])
         print()
         
         # Get initial status
@@ -109,11 +140,44 @@ def test_motor_controller():
         try:
             if 'mc' in locals():
                 mc.shutdown()
-        except:
+        except Exception:
             pass
         print("\nTest completed. Motors stopped.")
 
 
+def _wait_until(deadline, background=None, interval=0.1):
+    """
+    Wait until a time.monotonic() deadline, running background() meanwhile
+    
+    Args:
+        deadline: time.monotonic() value to wait for
+        background: Optional callable run every `interval` seconds while waiting
+        interval: Seconds between background calls
+    """
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        if background is not None:
+            background()
+            remaining = deadline - time.monotonic()
+        time.sleep(max(0.0, min(interval, remaining)))
+
+
+def _fault_monitor(mc):
+    """Return a callable that reports Motoron faults while a motor moves"""
+    reported = set()
+    
+    def check():
+        status = mc.get_status()
+        for flag in ('motor_fault', 'no_power', 'command_timeout'):
+            if status.get(flag) and flag not in reported:
+                print(f"  ⚠️  {flag.replace('_', ' ')} reported during move")
+                reported.add(flag)
+    
+    return check
+
+
 def test_individual_motor(mc):
     """Test a single motor"""
     try:
@@ -122,18 +186,20 @@ def test_individual_motor(mc):
             print("Invalid motor number!")
             return
         
+        monitor = _fault_monitor(mc)
+        
         print(f"\nTesting motor {motor_id}...")
         print("Forward direction...")
         mc.set_speed(motor_id, 200)
-        time.sleep(2)
+        _wait_until(time.monotonic() + 2, monitor)
         
         print("Stopping...")
         mc.set_speed(motor_id, 0)
-        time.sleep(1)
+        _wait_until(time.monotonic() + 1, monitor)
         
         print("Reverse direction...")
         mc.set_speed(motor_id, -200)
-        time.sleep(2)
+        _wait_until(time.monotonic() + 2, monitor)
         
         print("Stopping...")
         mc.set_speed(motor_id, 0)
@@ -157,6 +223,7 @@ def manual_motor_control(mc):
     print("\nManual Motor Control")
     print("Enter motor commands in format: motor_id speed")
     print("Example: '1 300' sets motor 1 to speed 300")
+    print("Example: '2 300; 3 -300' sets motors 2 and 3 together")
     print("Speed range: -800 to +800")
     print("Enter 'stop' to stop all motors, 'quit' to exit")
     print()
@@ -172,27 +239,30 @@ def manual_motor_control(mc):
                 print("✓ All motors stopped")
                 continue
             
-            parts = cmd.split()
-            if len(parts) != 2:
-                print("Invalid format. Use: motor_id speed")
-                continue
-            
-            motor_id = int(parts[0])
-            speed = int(parts[1])
-            
-            if motor_id not in [1, 2, 3]:
-                print("Motor ID must be 1, 2, or 3")
-                continue
-            
-            if abs(speed) > 800:
-                print("Speed must be between -800 and +800")
-                continue
-            
-            mc.set_speed(motor_id, speed)
-            print(f"✓ Motor {motor_id} speed set to {speed}")
+            # Several commands separated by ';' are queued and sent together by
+            # flush(); the whole line is rejected if any part is invalid
+            commands = []
+            for part in cmd.split(';'):
+                match = MOTOR_CMD_RE.match(part)
+                if not match:
+                    print("Invalid format. Use: motor_id speed (motor ID 1, 2, or 3)")
+                    break
+                
+                motor_id = int(match.group(1))
+                speed = int(match.group(2))
+                
+                if abs(speed) > 800:
+                    print("Speed must be between -800 and +800")
+                    break
+                
+                commands.append((motor_id, speed))
+            else:
+                for motor_id, speed in commands:
+                    mc.queue_speed(motor_id, speed)
+                mc.flush()
+                for motor_id, speed in commands:
+                    print(f"✓ Motor {motor_id} speed set to {speed}")
             
-        except ValueError:
-            print("Invalid input. Use numbers only.")
         except KeyboardInterrupt:
             print("\nExiting manual control...")
             break
@@ -205,46 +275,54 @@ def test_differential_drive(mc):
     print("\nTesting differential drive...")
     print("This assumes motors 1 and 2 are your drive wheels")
     
-    movements = [
-        ("Forward", 0.5, 0.0),
-        ("Backward", -0.5, 0.0),
-        ("Turn Left", 0.0, -0.5),
-        ("Turn Right", 0.0, 0.5),
-        ("Forward + Left", 0.3, -0.3),
-        ("Forward + Right", 0.3, 0.3),
-    ]
-    
-    for movement_name, linear, angular in movements:
-        print(f"  {movement_name} (linear={linear}, angular={angular})...")
-        mc.set_velocity(linear, angular)
-        time.sleep(2)
+    names = ("Forward", "Backward", "Turn Left", "Turn Right", "Forward + Left", "Forward + Right")
+    linear = (0.5, -0.5, 0.0, 0.0, 0.3, 0.3)
+    angular = (0.0, 0.0, -0.5, 0.5, -0.3, 0.3)
+    
+    # Work out every wheel speed up front so the timed loop only talks to the bus
+    wheel_speeds = [mc.get_wheel_speeds(lin, ang) for lin, ang in zip(linear, angular)]
+    
+    monitor = _fault_monitor(mc)
+    
+    for i, speeds in enumerate(wheel_speeds):
+        print(f"  {names[i]} (linear={linear[i]}, angular={angular[i]})...")
+        for motor_id, speed in speeds.items():
+            mc.queue_speed(motor_id, speed)
+        mc.flush()
+        _wait_until(time.monotonic() + 2, monitor)
         mc.stop()
-        time.sleep(1)
+        _wait_until(time.monotonic() + 1, monitor)
     
     print("✓ Differential drive test complete!")
 
 
 def show_motor_status(mc):
     """Display current motor status"""
-    print("\n=== Motor Status ===")
+    # Collect the report first and write it with a single print
+    lines = ["\n=== Motor Status ==="]
     status = mc.get_status()
     
     for key, value in status.items():
         if key == 'current_speeds':
-            print(f"{key}:")
+            lines.append(f"{key}:")
             for motor_id, speed in value.items():
-                print(f"  Motor {motor_id}: {speed}")
+                lines.append(f"  Motor {motor_id}: {speed}")
         elif key != 'motoron_status_flags':  # Skip raw status flags
-            print(f"{key}: {value}")
+            lines.append(f"{key}: {value}")
     
     # Try to get motor currents
-    print("\nMotor currents:")
+    lines.append("\nMotor currents:")
+    try:
+        currents = mc.get_all_currents()
+    except Exception:
+        currents = {}
     for motor_id in [1, 2, 3]:
-        try:
-            current = mc.get_motor_current(motor_id)
-            print(f"  Motor {motor_id}: {current:.2f} (raw units)")
-        except:
-            print(f"  Motor {motor_id}: Not available")
+        if motor_id in currents:
+            lines.append(f"  Motor {motor_id}: {currents[motor_id]:.2f} (raw units)")
+        else:
+            lines.append(f"  Motor {motor_id}: Not available")
+    
+    print("\n".join(lines))
 
 
 if __name__ == "__main__":
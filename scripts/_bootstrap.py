@@ -0,0 +1,15 @@
+"""
+Shared path setup for the scripts in this directory
+
+Importing this module puts src/ on sys.path once per process, so scripts can
+import core.* and utils.* when run directly.
+"""
+
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Encoder pulse counter using libgpiod edge events (no RPi.GPIO callbacks)
+
+The kernel queues edge events for both encoder lines; a single background
+thread drains them in batches, so Python runs once per batch instead of once
+per edge.
+"""
+
+import threading
+import time
+
+import gpiod
+from gpiod.line import Bias, Direction, Edge
+
+# Use BCM numbering - pins from robot_config.yaml
+GPIO_CHIP = '/dev/gpiochip0'
+LEFT_ENCODER_PIN = 12
+RIGHT_ENCODER_PIN = 27
+
+# Maximum edge events read per syscall
+EVENT_BATCH = 64
+
+
+class EdgeCounter:
+    """Counts edges on a set of GPIO lines from the kernel event FIFO"""
+
+    def __init__(self, pins, chip=GPIO_CHIP):
+        settings = gpiod.LineSettings(
+            direction=Direction.INPUT,
+            bias=Bias.PULL_UP,
+            edge_detection=Edge.BOTH
+        )
+        self.request = gpiod.request_lines(
+            chip,
+            consumer="encoder_reader",
+            config={tuple(pins): settings}
+        )
+        self.counts = {pin: 0 for pin in pins}
+        self.running = True
+        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.thread.start()
+
+    def _read_loop(self):
+        request = self.request
+        counts = self.counts
+        while self.running:
+            # Wake up periodically so stop() is noticed even without edges
+            if not request.wait_edge_events(0.2):
+                continue
+            for event in request.read_edge_events(EVENT_BATCH):
+                counts[event.line_offset] += 1
+
+    def get_count(self, pin):
+        return self.counts[pin]
+
+    def stop(self):
+        self.running = False
+        self.thread.join(timeout=1.0)
+        self.request.release()
+
+
+def main():
+    print("Setting up encoder edge counting via libgpiod...")
+    counter = EdgeCounter([LEFT_ENCODER_PIN, RIGHT_ENCODER_PIN])
+    print(f"[OK] Counting edges on GPIO{LEFT_ENCODER_PIN} and GPIO{RIGHT_ENCODER_PIN}")
+
+    print("Monitoring encoders for 10 seconds...")
+    print("Manually trigger encoders to see pulses...")
+
+    try:
+        time.sleep(10)
+    except KeyboardInterrupt:
+        print("\nTest interrupted")
+    finally:
+        counter.stop()
+        print(f"\nFinal counts - Left: {counter.get_count(LEFT_ENCODER_PIN)}  "
+              f"Right: {counter.get_count(RIGHT_ENCODER_PIN)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,84 @@
 #!/usr/bin/env python3
+"""
+Encoder + motor tester
 
-import RPi.GPIO as GPIO
+Usage:
+    python3 scripts/encoder_tester.py [--left PIN] [--right PIN]
+
+Pins default to hardware.sensors.encoders in robot_config.yaml.
+"""
+
+import argparse
 import time
 import sys
 import os
 
-# Add src/ to sys.path
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-ROOT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
-SRC_DIR = os.path.join(ROOT_DIR, 'src')
-if SRC_DIR not in sys.path:
-    sys.path.insert(0, SRC_DIR)
+from _bootstrap import ROOT_DIR
 
+from core.config_manager import ConfigManager
 from core.motors import MotorController
-import yaml
 
-# Use BCM numbering - pins from robot_config.yaml
+# Use BCM numbering - fallback when robot_config.yaml has no encoder pins
 LEFT_ENCODER_PIN = 12
 RIGHT_ENCODER_PIN = 27
 
-left_count = 0
-right_count = 0
-
-def left_encoder_callback(channel):
-    global left_count
-    left_count += 1
-    # Optional debug
-    # print("LEFT encoder pulse")
+# Seconds between counter reads in the display loop
+POLL_INTERVAL = 0.5
 
-def right_encoder_callback(channel):
-    global right_count
-    right_count += 1
-    # Optional debug
-    # print("RIGHT encoder pulse")
+# Fixed-width status line, written straight to the binary stdout in one call
+COUNTS_LINE = b'\rLeft: %8d  Right: %8d'
 
-def setup_encoders():
+# Edges are tallied inside pigpiod; Python only reads the counters
+def setup_encoders(pi, left_pin, right_pin):
+    import pigpio
     print("Setting up GPIO for encoders...")
-    GPIO.setmode(GPIO.BCM)
 
-    GPIO.setup(LEFT_ENCODER_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    GPIO.add_event_detect(LEFT_ENCODER_PIN, GPIO.BOTH, callback=left_encoder_callback)
-    print(f"[OK] Left encoder setup on GPIO{LEFT_ENCODER_PIN}")
+    pi.set_mode(left_pin, pigpio.INPUT)
+    pi.set_pull_up_down(left_pin, pigpio.PUD_UP)
+    left_cb = pi.callback(left_pin, pigpio.EITHER_EDGE)
+    print(f"[OK] Left encoder setup on GPIO{left_pin}")
+
+    pi.set_mode(right_pin, pigpio.INPUT)
+    pi.set_pull_up_down(right_pin, pigpio.PUD_UP)
+    right_cb = pi.callback(right_pin, pigpio.EITHER_EDGE)
+    print(f"[OK] Right encoder setup on GPIO{right_pin}")
+
+    return left_cb, right_cb
 
-    GPIO.setup(RIGHT_ENCODER_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    GPIO.add_event_detect(RIGHT_ENCODER_PIN, GPIO.BOTH, callback=right_encoder_callback)
-    print(f"[OK] Right encoder setup on GPIO{RIGHT_ENCODER_PIN}")
+CONFIG_PATH = os.path.join(ROOT_DIR, 'config', 'robot_config.yaml')
 
+# Loaded through the shared ConfigManager, which owns the parsed-config cache
 def load_motor_config():
-    config_path = os.path.join(ROOT_DIR, 'config', 'robot_config.yaml')
-    if os.path.exists(config_path):
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-        return config.get('motors', {})
-    return {}
+    return ConfigManager.instance(CONFIG_PATH).hardware.get('motors', {}).get('pololu_m3h550', {})
 
-def main():
-    GPIO.cleanup()  # Reset any old pin states
-    setup_encoders()
+def load_encoder_pins():
+    enc_cfg = ConfigManager.instance(CONFIG_PATH).hardware.get('sensors', {}).get('encoders', {})
+    return enc_cfg.get('left_pin', LEFT_ENCODER_PIN), enc_cfg.get('right_pin', RIGHT_ENCODER_PIN)
+
+# Helpers are bound as default arguments so the loop only does local lookups
+def poll_counts(left_tally, right_tally, deadline, _time=time.monotonic, _sleep=time.sleep,
+                _out=sys.stdout.buffer, _line=COUNTS_LINE, _interval=POLL_INTERVAL):
+    last_counts = None
+    while _time() < deadline:
+        # pigpiod keeps counting while we sleep; only redraw when the counts moved
+        counts = (left_tally(), right_tally())
+        if counts != last_counts:
+            _out.write(_line % counts)
+            _out.flush()
+            last_counts = counts
+        _sleep(_interval)
+
+def main(left=None, right=None):
+    import pigpio
+    default_left, default_right = load_encoder_pins()
+    left = default_left if left is None else left
+    right = default_right if right is None else right
+
+    pi = pigpio.pi()
+    if not pi.connected:
+        print("Cannot connect to pigpiod. Start it with: sudo pigpiod")
+        return
+    left_cb, right_cb = setup_encoders(pi, left, right)
 
     print("Initializing Motoron M3H550 motor controller...")
     motor_config = load_motor_config()
@@ -64,20 +86,27 @@ def main():
         motors = MotorController({'pololu_m3h550': motor_config})
     except Exception as e:
         print(f"Failed to initialize MotorController: {e}")
-        GPIO.cleanup()
+        left_cb.cancel()
+        right_cb.cancel()
+        pi.stop()
         return
 
     print("Starting motors and counting encoder pulses for 5 seconds...")
     motors.set_velocity(0.5, 0.0)
-    start_time = time.time()
     try:
-        while time.time() - start_time < 5:
-            print(f"Left: {left_count}  Right: {right_count}", end='\r')
-            time.sleep(0.1)
+        poll_counts(left_cb.tally, right_cb.tally, time.monotonic() + 5)
     finally:
         motors.stop()
-        GPIO.cleanup()
+        left_count = left_cb.tally()
+        right_count = right_cb.tally()
+        left_cb.cancel()
+        right_cb.cancel()
+        pi.stop()
         print(f"\nFinal counts - Left: {left_count}  Right: {right_count}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Spin both wheels and count encoder pulses")
+    parser.add_argument('--left', type=int, help="Left encoder BCM pin (default: from config)")
+    parser.add_argument('--right', type=int, help="Right encoder BCM pin (default: from config)")
+    args = parser.parse_args()
+    main(args.left, args.right)
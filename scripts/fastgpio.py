@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Register-level GPIO access through /dev/gpiomem (BCM2711 / Raspberry Pi 4)
+
+Pin reads are a single load from GPLEV0, so no GPIO library or kernel call is
+involved once the register block is mapped. The register layout is only valid
+on the BCM2711; other boards (Pi 3's BCM2835 family, Pi 5's RP1) must use a
+GPIO library instead, so check available() first.
+"""
+
+import mmap
+import os
+import struct
+
+GPIOMEM_PATH = '/dev/gpiomem'
+COMPATIBLE_PATH = '/proc/device-tree/compatible'
+SOC_COMPATIBLE = b'brcm,bcm2711'
+
+# BCM2711 GPIO register offsets (bytes from the start of the GPIO block)
+GPFSEL0 = 0x00                    # Function select, 3 bits per pin, 10 pins per register
+GPSET0 = 0x1C                     # Output set, 1 bit per pin
+GPCLR0 = 0x28                     # Output clear, 1 bit per pin
+GPLEV0 = 0x34                     # Pin level, 1 bit per pin
+GPIO_PUP_PDN_CNTRL_REG0 = 0xE4    # Pull-up/down, 2 bits per pin, 16 pins per register
+
+FSEL_INPUT = 0b000
+FSEL_OUTPUT = 0b001
+PULL_NONE = 0b00
+PULL_UP = 0b01
+
+REG = struct.Struct('<I')
+
+
+def available():
+    """True if /dev/gpiomem exists and the SoC is a BCM2711 (Raspberry Pi 4)"""
+    if not os.path.exists(GPIOMEM_PATH):
+        return False
+    try:
+        with open(COMPATIBLE_PATH, 'rb') as f:
+            # NUL-separated list, e.g. b'raspberrypi,4-model-b\0brcm,bcm2711\0'
+            return SOC_COMPATIBLE in f.read().split(b'\0')
+    except OSError:
+        return False
+
+
+class GpioMem:
+    """Minimal register-level GPIO access via /dev/gpiomem"""
+
+    def __init__(self, path=GPIOMEM_PATH, writable=True):
+        flags, prot = (os.O_RDWR | os.O_SYNC, mmap.PROT_READ | mmap.PROT_WRITE) if writable \
+            else (os.O_RDONLY | os.O_SYNC, mmap.PROT_READ)
+        fd = os.open(path, flags)
+        try:
+            self.mem = mmap.mmap(fd, 4096, mmap.MAP_SHARED, prot)
+        finally:
+            os.close(fd)
+
+    def _read(self, offset):
+        return REG.unpack_from(self.mem, offset)[0]
+
+    def _write(self, offset, value):
+        REG.pack_into(self.mem, offset, value)
+
+    def _set_function(self, pin, function):
+        offset = GPFSEL0 + (pin // 10) * 4
+        shift = (pin % 10) * 3
+        self._write(offset, (self._read(offset) & ~(0b111 << shift)) | (function << shift))
+
+    def set_input(self, pin, pull=PULL_UP):
+        self._set_function(pin, FSEL_INPUT)
+        offset = GPIO_PUP_PDN_CNTRL_REG0 + (pin // 16) * 4
+        shift = (pin % 16) * 2
+        self._write(offset, (self._read(offset) & ~(0b11 << shift)) | (pull << shift))
+
+    def set_output(self, pin):
+        self._set_function(pin, FSEL_OUTPUT)
+
+    def write(self, pin, value):
+        base = GPSET0 if value else GPCLR0
+        self._write(base + (pin // 32) * 4, 1 << (pin % 32))
+
+    def read(self, pin):
+        return (self._read(GPLEV0 + (pin // 32) * 4) >> (pin % 32)) & 1
+
+    def read_mask(self, mask):
+        """Levels of GPIO0-31 selected by mask, from one GPLEV0 read"""
+        return self._read(GPLEV0) & mask
+
+    def close(self):
+        self.mem.close()
+
+
+_reader = None
+
+def read_mask(mask):
+    """Read GPIO0-31 levels selected by mask through a shared read-only mapping"""
+    global _reader
+    if _reader is None:
+        _reader = GpioMem(writable=False)
+    return _reader.read_mask(mask)
+
+
+def read_pin(pin):
+    """Read one GPIO0-31 level through the shared read-only mapping"""
+    return (read_mask(1 << pin) >> pin) & 1
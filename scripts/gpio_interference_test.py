@@ -1,34 +1,138 @@
 #!/usr/bin/env python3
 """
 Step-by-step robot initialization test to isolate GPIO interference
+
+By default the test is passive: it snapshots the kernel's view of claimed GPIO
+lines and GPIO interrupt handlers before and after each robot import, without
+touching the pins. Pass --active to run the original probe, which claims the
+encoder pins through RPi.GPIO and re-adds edge detection at every step. The
+passive run only imports core.hardware_manager; constructing HardwareManager
+happens in the active run.
 """
 
-import sys
-import os
+import argparse
+
+import _bootstrap  # Puts src/ on sys.path
+
+# The active probe uses RPi.GPIO edge detection, as core.encoder does when
+# pigpiod is not running. Mode and pin setup happen once; each step removes
+# and re-adds edge detection, which is what raises once a step has broken it.
+ENCODER_PINS = (12, 27)   # Left and right encoder (BCM), as in hardware.sensors.encoders
+
+_pins_ready = False
+
+def _check_edge_detection():
+    """Re-add edge detection on the encoder pins, setting them up on first use"""
+    global _pins_ready
+    import RPi.GPIO as GPIO
+    if not _pins_ready:
+        GPIO.setmode(GPIO.BCM)
+        for pin in ENCODER_PINS:
+            GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        _pins_ready = True
+    for pin in ENCODER_PINS:
+        GPIO.remove_event_detect(pin)
+        GPIO.add_event_detect(pin, GPIO.BOTH)
+
+def _release_pins():
+    """Free the encoder pins so the next step (or the Encoder class) can claim them"""
+    global _pins_ready
+    if _pins_ready:
+        import RPi.GPIO as GPIO
+        GPIO.cleanup(list(ENCODER_PINS))
+        _pins_ready = False
+
+GPIO_DEBUG_PATH = '/sys/kernel/debug/gpio'
+INTERRUPTS_PATH = '/proc/interrupts'
+
+def _snapshot_gpio():
+    """Return (claimed GPIO lines, GPIO interrupt handlers) as seen by the kernel"""
+    claimed = set()
+    try:
+        with open(GPIO_DEBUG_PATH) as f:
+            for line in f:
+                # Claimed lines carry a consumer label: " gpio-12 (GPIO12 |encoder) in hi IRQ"
+                if line.lstrip().startswith('gpio-') and '|' in line:
+                    claimed.add(' '.join(line.split()))
+    except OSError as e:
+        print(f"  (cannot read {GPIO_DEBUG_PATH}: {e} - run as root with debugfs mounted)")
+
+    handlers = set()
+    try:
+        with open(INTERRUPTS_PATH) as f:
+            for line in f:
+                if 'gpio' in line.lower() or 'pinctrl' in line.lower():
+                    fields = line.split()
+                    # Drop the per-CPU counters, keep the IRQ number and handler description
+                    handlers.add(' '.join([fields[0]] + [x for x in fields[1:] if not x.isdigit()]))
+    except OSError as e:
+        print(f"  (cannot read {INTERRUPTS_PATH}: {e} - GPIO IRQ check skipped)")
+
+    return frozenset(claimed), frozenset(handlers)
+
+def _passive_step(name, action):
+    """Run one import step and report whether the kernel GPIO state changed"""
+    print(f"\n=== {name} ===")
+    before = _snapshot_gpio()
+    try:
+        action()
+    except Exception as e:
+        print(f"❌ Import failed: {e}")
+        return False
+    after = _snapshot_gpio()
+    if after == before:
+        print("✓ GPIO state unchanged")
+        return True
+    for label, old, new in (("claimed lines", before[0], after[0]), ("GPIO IRQs", before[1], after[1])):
+        for entry in sorted(new - old):
+            print(f"  + {label}: {entry}")
+        for entry in sorted(old - new):
+            print(f"  - {label}: {entry}")
+    return False
+
+def _import_logging():
+    from utils.logger import setup_logging
+    setup_logging()
+
+def _import_config():
+    from core.config_manager import ConfigManager
+    ConfigManager()
+
+def _import_encoder():
+    import core.encoder
+
+def _import_hardware_manager():
+    import core.hardware_manager
+
+def run_passive():
+    return [
+        ("After Logging", _passive_step("Step 1: Logging Import", _import_logging)),
+        ("After Config", _passive_step("Step 2: Config Import", _import_config)),
+        ("Robot Encoder", _passive_step("Step 3: Encoder Module Import", _import_encoder)),
+        # Import only: constructing HardwareManager claims the pins, so that is left to --active
+        ("Hardware Manager import", _passive_step("Step 4: Hardware Manager Import (import only)",
+                                                  _import_hardware_manager)),
+    ]
 
-# Add src directory to path
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-ROOT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
-SRC_DIR = os.path.join(ROOT_DIR, 'src')
-if SRC_DIR not in sys.path:
-    sys.path.insert(0, SRC_DIR)
+def run_active():
+    return [
+        ("Basic GPIO", test_gpio_basic()),
+        ("After Logging", test_after_logging()),
+        ("After Config", test_after_config()),
+        ("Robot Encoder", test_with_robot_encoder()),
+        ("Hardware Manager", test_with_hardware_manager()),
+    ]
 
 def test_gpio_basic():
     """Test basic GPIO before any robot imports"""
     print("=== Step 1: Basic GPIO Test ===")
-    import RPi.GPIO as GPIO
     try:
-        GPIO.cleanup()
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(12, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        GPIO.add_event_detect(12, GPIO.BOTH)
+        _check_edge_detection()
         print("✓ Basic GPIO edge detection works")
-        GPIO.remove_event_detect(12)
-        GPIO.cleanup()
         return True
     except Exception as e:
         print(f"❌ Basic GPIO failed: {e}")
-        GPIO.cleanup()
+        _release_pins()
         return False
 
 def test_after_logging():
@@ -37,19 +141,13 @@ def test_after_logging():
     from utils.logger import setup_logging
     setup_logging()
     
-    import RPi.GPIO as GPIO
     try:
-        GPIO.cleanup()
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(12, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        GPIO.add_event_detect(12, GPIO.BOTH)
+        _check_edge_detection()
         print("✓ GPIO works after logging import")
-        GPIO.remove_event_detect(12)
-        GPIO.cleanup()
         return True
     except Exception as e:
         print(f"❌ GPIO failed after logging: {e}")
-        GPIO.cleanup()
+        _release_pins()
         return False
 
 def test_after_config():
@@ -58,24 +156,20 @@ def test_after_config():
     from core.config_manager import ConfigManager
     config = ConfigManager()
     
-    import RPi.GPIO as GPIO
     try:
-        GPIO.cleanup()
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(12, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        GPIO.add_event_detect(12, GPIO.BOTH)
+        _check_edge_detection()
         print("✓ GPIO works after config import")
-        GPIO.remove_event_detect(12)
-        GPIO.cleanup()
         return True
     except Exception as e:
         print(f"❌ GPIO failed after config: {e}")
-        GPIO.cleanup()
+        _release_pins()
         return False
 
 def test_with_robot_encoder():
     """Test using the robot's actual Encoder class"""
     print("\n=== Step 4: Robot Encoder Class ===")
+    # The Encoder class claims the pin itself
+    _release_pins()
     from core.encoder import Encoder
     
     try:
@@ -109,15 +203,15 @@ def test_with_hardware_manager():
         return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find which robot import interferes with GPIO")
+    parser.add_argument('--active', action='store_true',
+                        help="Claim the encoder pins with RPi.GPIO and probe edge detection at each step")
+    args = parser.parse_args()
+    
     print("GPIO Interference Detection Test")
     print("=" * 40)
     
-    results = []
-    results.append(("Basic GPIO", test_gpio_basic()))
-    results.append(("After Logging", test_after_logging()))
-    results.append(("After Config", test_after_config()))
-    results.append(("Robot Encoder", test_with_robot_encoder()))
-    results.append(("Hardware Manager", test_with_hardware_manager()))
+    results = run_active() if args.active else run_passive()
     
     print("\n" + "=" * 40)
     print("RESULTS:")
@@ -1,66 +1,134 @@
 #!/usr/bin/env python3
 """
 GPIO reset and recovery script
+
+Talks to the BCM2711 (Raspberry Pi 4) GPIO registers directly through
+/dev/gpiomem, so no GPIO library is needed for the reset itself. Falls back to
+RPi.GPIO on other boards or when /dev/gpiomem is not available.
 """
 
-import RPi.GPIO as GPIO
 import time
 
-print("=== GPIO Reset and Recovery ===")
+from fastgpio import GpioMem, PULL_UP, available
+
+
+def reset_with_gpiomem():
+    print("1. Opening /dev/gpiomem...")
+    gpio = GpioMem()
+    print("   ✓ GPIO registers mapped")
+
+    print("2. Testing and resetting pin 17...")
+    try:
+        # Try different configurations to unstick the pin
+        gpio.set_output(17)
+        gpio.write(17, 1)
+        time.sleep(0.1)
+        gpio.write(17, 0)
+        time.sleep(0.1)
+        print("   ✓ Pin 17 output test completed")
+
+        # Now set it back to input
+        gpio.set_input(17, PULL_UP)
+        time.sleep(0.1)
+        print(f"   Pin 17 state after reset: {gpio.read(17)}")
+    except Exception as e:
+        print(f"   Error: {e}")
+
+    print("3. Testing pin 27...")
+    try:
+        gpio.set_input(27, PULL_UP)
+        print(f"   Pin 27 state: {gpio.read(27)}")
+    except Exception as e:
+        print(f"   Error: {e}")
+
+    print("4. Final cleanup...")
+    gpio.close()
+    print("   ✓ Pins left as pulled-up inputs")
+
+    # Edge detection is kernel-side, so it can only be checked through a GPIO library
+    print("5. Testing edge detection...")
+    try:
+        import RPi.GPIO as GPIO
+    except ImportError:
+        print("   RPi.GPIO not installed, edge detection not checked")
+        return
+    GPIO.setmode(GPIO.BCM)
+    for pin in (17, 27):
+        try:
+            GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            GPIO.add_event_detect(pin, GPIO.BOTH)
+            print(f"   ✓ Pin {pin} edge detection working")
+            GPIO.remove_event_detect(pin)
+        except Exception as e:
+            print(f"   Error: {e}")
+    GPIO.cleanup()
+
+
+def reset_with_rpi_gpio():
+    import RPi.GPIO as GPIO
 
-print("1. Aggressive GPIO cleanup...")
-try:
+    print("1. Aggressive GPIO cleanup...")
+    try:
+        GPIO.cleanup()
+        print("   ✓ GPIO cleanup completed")
+    except Exception as e:
+        print(f"   Warning: {e}")
+
+    print("2. Resetting GPIO mode...")
+    try:
+        GPIO.setmode(GPIO.BCM)
+        print("   ✓ GPIO mode set to BCM")
+    except Exception as e:
+        print(f"   Error: {e}")
+
+    print("3. Testing and resetting pin 17...")
+    try:
+        # Try different configurations to unstick the pin
+        GPIO.setup(17, GPIO.OUT)
+        GPIO.output(17, GPIO.HIGH)
+        time.sleep(0.1)
+        GPIO.output(17, GPIO.LOW)
+        time.sleep(0.1)
+        print("   ✓ Pin 17 output test completed")
+
+        # Now set it back to input
+        GPIO.setup(17, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        time.sleep(0.1)
+        state = GPIO.input(17)
+        print(f"   Pin 17 state after reset: {state}")
+
+        # Test edge detection
+        GPIO.add_event_detect(17, GPIO.BOTH)
+        print("   ✓ Pin 17 edge detection working")
+        GPIO.remove_event_detect(17)
+
+    except Exception as e:
+        print(f"   Error: {e}")
+
+    print("4. Testing pin 27...")
+    try:
+        GPIO.setup(27, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        state = GPIO.input(27)
+        print(f"   Pin 27 state: {state}")
+
+        GPIO.add_event_detect(27, GPIO.BOTH)
+        print("   ✓ Pin 27 edge detection working")
+        GPIO.remove_event_detect(27)
+
+    except Exception as e:
+        print(f"   Error: {e}")
+
+    print("5. Final cleanup...")
     GPIO.cleanup()
     print("   ✓ GPIO cleanup completed")
-except Exception as e:
-    print(f"   Warning: {e}")
 
-print("2. Resetting GPIO mode...")
-try:
-    GPIO.setmode(GPIO.BCM)
-    print("   ✓ GPIO mode set to BCM")
-except Exception as e:
-    print(f"   Error: {e}")
-
-print("3. Testing and resetting pin 17...")
-try:
-    # Try different configurations to unstick the pin
-    GPIO.setup(17, GPIO.OUT)
-    GPIO.output(17, GPIO.HIGH)
-    time.sleep(0.1)
-    GPIO.output(17, GPIO.LOW)
-    time.sleep(0.1)
-    print("   ✓ Pin 17 output test completed")
-    
-    # Now set it back to input
-    GPIO.setup(17, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    time.sleep(0.1)
-    state = GPIO.input(17)
-    print(f"   Pin 17 state after reset: {state}")
-    
-    # Test edge detection
-    GPIO.add_event_detect(17, GPIO.BOTH)
-    print("   ✓ Pin 17 edge detection working")
-    GPIO.remove_event_detect(17)
-    
-except Exception as e:
-    print(f"   Error: {e}")
-
-print("4. Testing pin 27...")
-try:
-    GPIO.setup(27, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    state = GPIO.input(27)
-    print(f"   Pin 27 state: {state}")
-    
-    GPIO.add_event_detect(27, GPIO.BOTH)
-    print("   ✓ Pin 27 edge detection working")
-    GPIO.remove_event_detect(27)
-    
-except Exception as e:
-    print(f"   Error: {e}")
-
-print("5. Final cleanup...")
-GPIO.cleanup()
-print("   ✓ GPIO cleanup completed")
+
+print("=== GPIO Reset and Recovery ===")
+
+if available():
+    reset_with_gpiomem()
+else:
+    print("/dev/gpiomem not found or not a BCM2711, using RPi.GPIO")
+    reset_with_rpi_gpio()
 
 print("=== Reset Complete ===")
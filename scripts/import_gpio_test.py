@@ -4,23 +4,42 @@ Test which robot import causes GPIO issues
 """
 
 import RPi.GPIO as GPIO
-import sys
-import os
+import importlib
 
-# Add src/ to sys.path
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-ROOT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
-SRC_DIR = os.path.join(ROOT_DIR, 'src')
-if SRC_DIR not in sys.path:
-    sys.path.insert(0, SRC_DIR)
+import _bootstrap  # Puts src/ on sys.path
 
-def test_gpio_after_import(import_name, import_statement):
+TEST_PIN = 12
+
+def setup_test_pin():
+    """Configure the test pin with edge detection (done once, or after a failure)"""
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setup(TEST_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+    GPIO.add_event_detect(TEST_PIN, GPIO.BOTH)
+
+def check_test_pin():
+    """
+    Check the pin is still configured as set up, then re-add edge detection
+    
+    Mode and pin setup are only checked, but edge detection is removed and
+    added again: event_detected() just returns False once detection is lost,
+    so re-adding it is what raises when an import broke it.
+    """
+    if GPIO.getmode() != GPIO.BCM:
+        raise RuntimeError(f"GPIO mode changed to {GPIO.getmode()}")
+    if GPIO.gpio_function(TEST_PIN) != GPIO.IN:
+        raise RuntimeError(f"GPIO{TEST_PIN} is no longer an input")
+    GPIO.input(TEST_PIN)              # Raises if the channel was cleaned up
+    GPIO.remove_event_detect(TEST_PIN)
+    GPIO.add_event_detect(TEST_PIN, GPIO.BOTH)
+
+def test_gpio_after_import(import_name, module_name, attr=None):
     """Test GPIO after a specific import"""
     print(f"\n=== Testing after importing {import_name} ===")
     
     try:
-        # Execute the import
-        exec(import_statement)
+        module = importlib.import_module(module_name)
+        if attr:
+            getattr(module, attr)
         print(f"✓ Import successful: {import_name}")
     except Exception as e:
         print(f"❌ Import failed: {import_name} - {e}")
@@ -28,44 +47,44 @@ def test_gpio_after_import(import_name, import_statement):
     
     # Test GPIO
     try:
-        GPIO.cleanup()
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(12, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        GPIO.add_event_detect(12, GPIO.BOTH)
-        GPIO.remove_event_detect(12)
-        GPIO.cleanup()
+        check_test_pin()
         print(f"✓ GPIO test passed after {import_name}")
         return True
     except Exception as e:
         print(f"❌ GPIO test failed after {import_name}: {e}")
+        # Start the next import from a clean, known pin state
         GPIO.cleanup()
+        try:
+            setup_test_pin()
+        except Exception as e:
+            print(f"❌ Could not reconfigure GPIO{TEST_PIN}: {e}")
         return False
 
 # Test imports one by one
+# (label, module, attribute to look up or None)
 imports_to_test = [
-    ("yaml", "import yaml"),
-    ("core.motors", "from core.motors import MotorController"),
-    ("core.config_manager", "from core.config_manager import ConfigManager"),
-    ("core.encoder", "from core.encoder import Encoder"),
+    ("yaml", "yaml", None),
+    ("core.motors", "core.motors", "MotorController"),
+    ("core.config_manager", "core.config_manager", "ConfigManager"),
+    ("core.encoder", "core.encoder", "Encoder"),
 ]
 
 print("Testing which robot import breaks GPIO...")
 
-# Initial GPIO test
+# Initial GPIO test; the pin stays configured for the import checks below
 print("=== Initial GPIO test (no imports) ===")
 GPIO.cleanup()
-GPIO.setmode(GPIO.BCM)
-GPIO.setup(12, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 try:
-    GPIO.add_event_detect(12, GPIO.BOTH)
-    GPIO.remove_event_detect(12)
+    setup_test_pin()
     print("✓ Initial GPIO test passed")
 except Exception as e:
     print(f"❌ Initial GPIO test failed: {e}")
-GPIO.cleanup()
 
 # Test each import
-for import_name, import_statement in imports_to_test:
-    test_gpio_after_import(import_name, import_statement)
+try:
+    for import_name, module_name, attr in imports_to_test:
+        test_gpio_after_import(import_name, module_name, attr)
+finally:
+    GPIO.cleanup()
 
 print("\n=== Test Complete ===")
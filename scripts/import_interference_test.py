@@ -3,16 +3,9 @@
 Test to isolate which robot module import is causing GPIO interference
 """
 
-import sys
-import os
 import RPi.GPIO as GPIO
 
-# Add src directory to path
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-ROOT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
-SRC_DIR = os.path.join(ROOT_DIR, 'src')
-if SRC_DIR not in sys.path:
-    sys.path.insert(0, SRC_DIR)
+import _bootstrap  # Puts src/ on sys.path
 
 def test_pin17():
     """Test pin 17 GPIO functionality"""
@@ -28,13 +28,7 @@ def test_gpio_after_imports():
     print("\n=== Testing GPIO AFTER robot imports ===")
     
     # Add path and import modules
-    import sys
-    import os
-    SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-    ROOT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
-    SRC_DIR = os.path.join(ROOT_DIR, 'src')
-    if SRC_DIR not in sys.path:
-        sys.path.insert(0, SRC_DIR)
+    import _bootstrap  # Puts src/ on sys.path
     
     print("Importing robot modules...")
     from core.motors import MotorController
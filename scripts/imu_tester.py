@@ -4,49 +4,166 @@ GY-521 (MPU-6050) IMU Test Script for Ruohobot
 Tests IMU initialization, data reading, and basic functionality.
 """
 
+import argparse
+import functools
 import time
+import struct
 import sys
 import os
 
-# Add src/ to sys.path
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-ROOT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
-SRC_DIR = os.path.join(ROOT_DIR, 'src')
-if SRC_DIR not in sys.path:
-    sys.path.insert(0, SRC_DIR)
+from _bootstrap import ROOT_DIR
 
-try:
-    from mpu6050 import mpu6050
-except ImportError:
-    print("❌ mpu6050 library not found.")
-    print("Install with: sudo python3 -m pip install --break-system-packages mpu6050-raspberrypi")
-    exit(1)
+# I2C bus and address for GY-521
+IMU_I2C_BUS = 1
+IMU_I2C_ADDRESS = 0x68
+MPU6050_PWR_MGMT_1 = 0x6B
 
-from core.imu import IMU
-import yaml
+# MPU-6050 data registers: ACCEL_XOUT_H (0x3B) .. GYRO_ZOUT_L (0x48) are contiguous,
+# so accel, temperature and gyro come back in a single 14-byte burst
+MPU6050_ACCEL_XOUT_H = 0x3B
+MPU6050_BURST = struct.Struct('>hhhhhhh')
+ACCEL_LSB_PER_G = 16384.0     # +-2 g (power-on default)
+GYRO_LSB_PER_DPS = 131.0      # +-250 deg/s (power-on default)
+GRAVITY_MS2 = 9.80665         # Same constant the mpu6050 library scales by
 
-# I2C address for GY-521
-IMU_I2C_ADDRESS = 0x68
+# MPU-6050 FIFO: frames are queued on-chip in the same register order as the burst
+MPU6050_SMPLRT_DIV = 0x19
+MPU6050_CONFIG = 0x1A
+MPU6050_FIFO_EN = 0x23
+MPU6050_USER_CTRL = 0x6A
+MPU6050_FIFO_COUNTH = 0x72
+MPU6050_FIFO_R_W = 0x74
+FIFO_EN_TEMP_GYRO_ACCEL = 0xF8
+USER_CTRL_FIFO_EN = 0x40
+USER_CTRL_FIFO_RESET = 0x04
+FIFO_SIZE = 1024
+FIFO_RATE_HZ = 100            # 1 kHz internal rate (DLPF on) / (1 + SMPLRT_DIV)
+FIFO_POLL_NS = 100_000_000   # Drain the FIFO every 100 ms
+LIVE_ROW_NS = 500_000_000    # One printed row every 0.5 s
+
+# yaml, smbus2 and core.imu are imported where they are used so --help and
+# --skip-yaml start without loading them
+_bus = None
+
+def _get_bus():
+    """Open the I2C bus once and share the handle for the whole run"""
+    global _bus
+    if _bus is None:
+        try:
+            import smbus2
+        except ImportError:
+            print("❌ smbus2 library not found.")
+            print("Install with: sudo python3 -m pip install --break-system-packages smbus2")
+            exit(1)
+        _bus = smbus2.SMBus(IMU_I2C_BUS)
+    return _bus
+
+# One live_data_test row: elapsed, accel x/y/z, gyro x/y/z, temperature
+LIVE_ROW = "  {:6.1f}s | {:8.3f} | {:8.3f} | {:8.3f} | {:7.1f} | {:7.1f} | {:7.1f} | {:4.1f}°C\n".format
+
+def _scale(ax, ay, az, temp, gx, gy, gz):
+    return (ax / ACCEL_LSB_PER_G, ay / ACCEL_LSB_PER_G, az / ACCEL_LSB_PER_G,
+            gx / GYRO_LSB_PER_DPS, gy / GYRO_LSB_PER_DPS, gz / GYRO_LSB_PER_DPS,
+            temp / 340.0 + 36.53)
+
+def read_burst_values(sensor):
+    """Read one burst as a flat (ax, ay, az, gx, gy, gz, temp) tuple of scaled values"""
+    raw = sensor.bus.read_i2c_block_data(sensor.address, MPU6050_ACCEL_XOUT_H, MPU6050_BURST.size)
+    return _scale(*MPU6050_BURST.unpack(bytes(raw)))
+
+def start_fifo(sensor, rate_hz=FIFO_RATE_HZ):
+    """Queue accel, temperature and gyro frames in the on-chip FIFO at rate_hz"""
+    bus, addr = sensor.bus, sensor.address
+    bus.write_byte_data(addr, MPU6050_CONFIG, 0x01)   # DLPF on -> 1 kHz sample clock
+    bus.write_byte_data(addr, MPU6050_SMPLRT_DIV, 1000 // rate_hz - 1)
+    bus.write_byte_data(addr, MPU6050_USER_CTRL, USER_CTRL_FIFO_RESET)
+    bus.write_byte_data(addr, MPU6050_FIFO_EN, FIFO_EN_TEMP_GYRO_ACCEL)
+    bus.write_byte_data(addr, MPU6050_USER_CTRL, USER_CTRL_FIFO_EN)
+
+def stop_fifo(sensor):
+    """Disable the FIFO and restore the power-on sample rate settings"""
+    bus, addr = sensor.bus, sensor.address
+    bus.write_byte_data(addr, MPU6050_FIFO_EN, 0)
+    bus.write_byte_data(addr, MPU6050_USER_CTRL, USER_CTRL_FIFO_RESET)
+    bus.write_byte_data(addr, MPU6050_SMPLRT_DIV, 0)
+    bus.write_byte_data(addr, MPU6050_CONFIG, 0)
+
+def read_fifo_bytes(sensor):
+    """Drain all complete FIFO frames as one bytes object (14 big-endian bytes per frame)"""
+    bus, addr = sensor.bus, sensor.address
+    high, low = bus.read_i2c_block_data(addr, MPU6050_FIFO_COUNTH, 2)
+    count = (high << 8) | low
+    if count >= FIFO_SIZE:
+        # Overflowed: the oldest frames were overwritten, so realign from empty
+        bus.write_byte_data(addr, MPU6050_USER_CTRL, USER_CTRL_FIFO_RESET | USER_CTRL_FIFO_EN)
+        return b''
+    count -= count % MPU6050_BURST.size
+    if not count:
+        return b''
+    
+    # A plain I2C read transfer has no 32-byte SMBus block limit, so the whole
+    # backlog comes out in one transaction
+    from smbus2 import i2c_msg
+    read = i2c_msg.read(addr, count)
+    bus.i2c_rdwr(i2c_msg.write(addr, [MPU6050_FIFO_R_W]), read)
+    return bytes(read)
+
+def read_fifo(sensor):
+    """Drain all complete FIFO frames as raw (ax, ay, az, temp, gx, gy, gz) int tuples"""
+    # Left unscaled: callers average raw counts and scale once
+    return list(MPU6050_BURST.iter_unpack(read_fifo_bytes(sensor)))
+
+def read_burst(sensor):
+    """Read accel (g), gyro (deg/s) and temperature (C) in one I2C transaction"""
+    ax, ay, az, gx, gy, gz, temp = read_burst_values(sensor)
+    return {'x': ax, 'y': ay, 'z': az}, {'x': gx, 'y': gy, 'z': gz}, temp
+
+class MPU6050:
+    """Minimal MPU-6050 driver on the shared bus, API-compatible with the mpu6050 library"""
+    
+    def __init__(self, address=IMU_I2C_ADDRESS):
+        self.bus = _get_bus()
+        self.address = address
+        self.bus.write_byte_data(address, MPU6050_PWR_MGMT_1, 0x00)   # Wake from sleep
+    
+    def get_accel_data(self, g=False):
+        """Acceleration in m/s^2 like the library, or in g with g=True"""
+        ax, ay, az = read_burst_values(self)[:3]
+        if not g:
+            ax, ay, az = ax * GRAVITY_MS2, ay * GRAVITY_MS2, az * GRAVITY_MS2
+        return {'x': ax, 'y': ay, 'z': az}
+    
+    def get_gyro_data(self):
+        gx, gy, gz = read_burst_values(self)[3:6]
+        return {'x': gx, 'y': gy, 'z': gz}
+    
+    def get_temp(self):
+        return read_burst_values(self)[6]
+
+CONFIG_PATH = os.path.join(ROOT_DIR, 'config', 'robot_config.yaml')
+
+@functools.lru_cache(maxsize=8)
+def _parse_config(path, mtime_ns, size):
+    # mtime_ns and size only key the cache so an edited file is re-read
+    import yaml
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
 
 def load_imu_config():
     """Load IMU configuration from robot_config.yaml"""
-    config_path = os.path.join(ROOT_DIR, 'config', 'robot_config.yaml')
-    if os.path.exists(config_path):
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+    if os.path.exists(CONFIG_PATH):
+        stat = os.stat(CONFIG_PATH)
+        config = _parse_config(CONFIG_PATH, stat.st_mtime_ns, stat.st_size)
         return config.get('hardware', {}).get('sensors', {}).get('imu', {})
     return {}
 
-def test_raw_mpu6050():
+def test_raw_mpu6050(sensor):
     """Test raw MPU-6050 communication"""
     print("🔍 Testing raw MPU-6050 communication...")
     try:
-        sensor = mpu6050(IMU_I2C_ADDRESS)
         
         # Test basic read
-        accel = sensor.get_accel_data()
-        gyro = sensor.get_gyro_data()
-        temp = sensor.get_temp()
+        accel, gyro, temp = read_burst(sensor)
         
         if accel is None or gyro is None:
             print("❌ Failed to read IMU data")
@@ -61,14 +178,19 @@ def test_raw_mpu6050():
         print(f"❌ Raw MPU-6050 test failed: {e}")
         return False
 
-def test_robot_imu_class():
+def test_robot_imu_class(sensor, config=None):
     """Test the robot's IMU class"""
     print("\n🔍 Testing robot IMU class...")
     try:
-        config = load_imu_config()
+        from core.imu import IMU
+        if config is None:
+            config = load_imu_config()
         i2c_addr = config.get('i2c_address', IMU_I2C_ADDRESS)
         
-        imu = IMU(i2c_address=i2c_addr)
+        # Reuse the shared sensor unless the config points at another address
+        if i2c_addr != sensor.address:
+            sensor = MPU6050(i2c_addr)
+        imu = IMU(i2c_address=i2c_addr, sensor=sensor)
         
         # Test all methods
         accel = imu.get_accel()
@@ -83,25 +205,18 @@ def test_robot_imu_class():
         print(f"✅ Robot IMU class working correctly")
         print(f"   I2C Address: 0x{i2c_addr:02X}")
         print(f"   Temperature: {temp:.1f}°C")
-        print(f"   Accelerometer: X={accel['x']:.3f}, Y={accel['y']:.3f}, Z={accel['z']:.3f} g")
+        print(f"   Accelerometer: X={accel['x']:.3f}, Y={accel['y']:.3f}, Z={accel['z']:.3f} m/s²")
         print(f"   Gyroscope: X={gyro['x']:.3f}, Y={gyro['y']:.3f}, Z={gyro['z']:.3f} °/s")
         return True
     except Exception as e:
         print(f"❌ Robot IMU class test failed: {e}")
         return False
 
-def test_tilt_detection():
+def test_tilt_detection(sensor):
     """Test basic tilt detection (Z-axis should be ~1g when upright)"""
     print("\n🔍 Testing tilt detection...")
     try:
-        sensor = mpu6050(IMU_I2C_ADDRESS)
-        accel = sensor.get_accel_data()
-        
-        if accel is None:
-            print("❌ Failed to read accelerometer data")
-            return False
-        
-        z_axis = accel['z']
+        z_axis = read_burst_values(sensor)[2]
         is_upright = abs(z_axis - 1.0) < 0.3  # Within 0.3g of 1g
         
         if is_upright:
@@ -114,29 +229,40 @@ def test_tilt_detection():
         print(f"❌ Tilt detection test failed: {e}")
         return False
 
-def live_data_test():
-    """Show live IMU data for 10 seconds"""
+def live_data_test(sensor, raw_log=None):
+    """
+    Show live IMU data for 10 seconds (each row averages the FIFO frames since the last one)
+    
+    If raw_log is a binary file, every FIFO frame is also appended to it as the
+    chip's 14 raw bytes (decode with struct format '>hhhhhhh').
+    """
     print("\n📊 Live IMU data test (10 seconds)...")
     try:
-        sensor = mpu6050(IMU_I2C_ADDRESS)
-        start_time = time.time()
+        start_fifo(sensor)
+        start_ns = time.monotonic_ns()
+        deadline_ns = start_ns + 10_000_000_000
+        next_poll_ns = start_ns
+        next_row_ns = start_ns + LIVE_ROW_NS
+        write = sys.stdout.write
+        frames = []
         
         print("    Time |  Accel X |  Accel Y |  Accel Z |  Gyro X |  Gyro Y |  Gyro Z | Temp")
         print("    -----|----------|----------|----------|---------|---------|---------|-----")
         
-        while time.time() - start_time < 10:
-            accel = sensor.get_accel_data()
-            gyro = sensor.get_gyro_data()
-            temp = sensor.get_temp()
-            
-            if accel is None or gyro is None:
-                print("❌ Failed to read IMU data during live test")
-                return False
-            
-            elapsed = time.time() - start_time
-            print(f"  {elapsed:6.1f}s | {accel['x']:8.3f} | {accel['y']:8.3f} | {accel['z']:8.3f} | "
-                  f"{gyro['x']:7.1f} | {gyro['y']:7.1f} | {gyro['z']:7.1f} | {temp:4.1f}°C")
-            time.sleep(0.5)
+        # Fixed schedule: oversleeping one poll shortens the next wait instead of drifting
+        while (now := time.monotonic_ns()) < deadline_ns:
+            next_poll_ns += FIFO_POLL_NS
+            time.sleep(max(0, next_poll_ns - now) / 1e9)
+            buf = read_fifo_bytes(sensor)
+            if raw_log is not None:
+                raw_log.write(buf)
+            frames += MPU6050_BURST.iter_unpack(buf)
+            now = time.monotonic_ns()
+            if now >= next_row_ns and frames:
+                n = len(frames)
+                write(LIVE_ROW((now - start_ns) / 1e9, *_scale(*(sum(col) / n for col in zip(*frames)))))
+                frames = []
+                next_row_ns += LIVE_ROW_NS
         
         print("✅ Live data test completed")
         return True
@@ -146,23 +272,51 @@ def live_data_test():
     except Exception as e:
         print(f"❌ Live data test failed: {e}")
         return False
+    finally:
+        try:
+            stop_fifo(sensor)
+        except Exception:
+            pass
 
 def main():
+    parser = argparse.ArgumentParser(description="Test the GY-521 (MPU-6050) IMU")
+    parser.add_argument('--skip-yaml', action='store_true',
+                        help="Don't read robot_config.yaml; use the default I2C address")
+    parser.add_argument('--raw-log', metavar='FILE',
+                        help="Also save every raw FIFO frame from the live test to FILE")
+    args = parser.parse_args()
+    
     print("🤖 Ruohobot GY-521 IMU Test")
     print("=" * 40)
     
+    imu_config = {} if args.skip_yaml else None
+    raw_log = open(args.raw_log, 'wb') if args.raw_log else None
+    
+    # One sensor handle shared by every test, so the I2C bus is opened and
+    # the MPU-6050 woken up only once
+    try:
+        sensor = MPU6050(IMU_I2C_ADDRESS)
+    except Exception as e:
+        print(f"❌ Could not initialize MPU-6050 at 0x{IMU_I2C_ADDRESS:02X}: {e}")
+        sensor = None
+    
     # Test sequence
     tests = [
         test_raw_mpu6050,
-        test_robot_imu_class, 
+        lambda sensor: test_robot_imu_class(sensor, imu_config),
         test_tilt_detection,
-        live_data_test
+        lambda sensor: live_data_test(sensor, raw_log)
     ]
     
     passed = 0
-    for test in tests:
-        if test():
-            passed += 1
+    try:
+        if sensor is not None:
+            for test in tests:
+                if test(sensor):
+                    passed += 1
+    finally:
+        if raw_log is not None:
+            raw_log.close()
     
     print(f"\n📋 Test Summary: {passed}/{len(tests)} tests passed")
     
@@ -1,55 +1,62 @@
 #!/usr/bin/env python3
 """
 Minimal encoder test without robot imports
+
+Edges are tallied inside pigpiod (start it with: sudo pigpiod), so no Python
+code runs per pulse.
 """
 
-import RPi.GPIO as GPIO
+import pigpio
 import time
 
 # Use BCM numbering - pins from robot_config.yaml
 LEFT_ENCODER_PIN = 12
 RIGHT_ENCODER_PIN = 27
 
-left_count = 0
-right_count = 0
-
-def left_encoder_callback(channel):
-    global left_count
-    left_count += 1
-    print(f"Left encoder pulse: {left_count}")
-
-def right_encoder_callback(channel):
-    global right_count
-    right_count += 1
-    print(f"Right encoder pulse: {right_count}")
-
-def setup_encoders():
+def setup_encoders(pi):
     print("Setting up GPIO for encoders...")
-    GPIO.setmode(GPIO.BCM)
 
-    GPIO.setup(LEFT_ENCODER_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    GPIO.add_event_detect(LEFT_ENCODER_PIN, GPIO.BOTH, callback=left_encoder_callback)
+    pi.set_mode(LEFT_ENCODER_PIN, pigpio.INPUT)
+    pi.set_pull_up_down(LEFT_ENCODER_PIN, pigpio.PUD_UP)
+    left_cb = pi.callback(LEFT_ENCODER_PIN, pigpio.EITHER_EDGE)
     print(f"[OK] Left encoder setup on GPIO{LEFT_ENCODER_PIN}")
 
-    GPIO.setup(RIGHT_ENCODER_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    GPIO.add_event_detect(RIGHT_ENCODER_PIN, GPIO.BOTH, callback=right_encoder_callback)
+    pi.set_mode(RIGHT_ENCODER_PIN, pigpio.INPUT)
+    pi.set_pull_up_down(RIGHT_ENCODER_PIN, pigpio.PUD_UP)
+    right_cb = pi.callback(RIGHT_ENCODER_PIN, pigpio.EITHER_EDGE)
     print(f"[OK] Right encoder setup on GPIO{RIGHT_ENCODER_PIN}")
 
+    return left_cb, right_cb
+
 def main():
-    GPIO.cleanup()  # Reset any old pin states
-    setup_encoders()
+    pi = pigpio.pi()
+    if not pi.connected:
+        print("Cannot connect to pigpiod. Start it with: sudo pigpiod")
+        return
+    left_cb, right_cb = setup_encoders(pi)
 
     print("Monitoring encoders for 10 seconds...")
     print("Manually trigger encoders to see pulses...")
-    
-    start_time = time.time()
+
+    deadline_ns = time.monotonic_ns() + 10_000_000_000
+    next_read_ns = time.monotonic_ns()
+    last_counts = (0, 0)
     try:
-        while time.time() - start_time < 10:
-            time.sleep(0.1)
+        while (now := time.monotonic_ns()) < deadline_ns:
+            next_read_ns += 1_000_000_000
+            time.sleep(max(0, min(next_read_ns, deadline_ns) - now) / 1e9)
+            counts = (left_cb.tally(), right_cb.tally())
+            if counts != last_counts:
+                print(f"Left pulses: {counts[0]}  Right pulses: {counts[1]}")
+                last_counts = counts
     except KeyboardInterrupt:
         print("\nTest interrupted")
     finally:
-        GPIO.cleanup()
+        left_count = left_cb.tally()
+        right_count = right_cb.tally()
+        left_cb.cancel()
+        right_cb.cancel()
+        pi.stop()
         print(f"\nFinal counts - Left: {left_count}  Right: {right_count}")
 
 if __name__ == "__main__":
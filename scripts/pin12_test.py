@@ -6,6 +6,8 @@ Quick test for GPIO 12 edge detection
 import RPi.GPIO as GPIO
 import time
 
+import fastgpio
+
 print("Testing GPIO 12 edge detection...")
 
 try:
@@ -16,6 +18,9 @@ try:
     GPIO.setup(12, GPIO.IN, pull_up_down=GPIO.PUD_UP)
     state = GPIO.input(12)
     print(f"Pin 12 initial state: {state}")
+    if fastgpio.available():
+        # Same level straight from GPLEV0; a mismatch means RPi.GPIO is out of sync
+        print(f"Pin 12 register level: {fastgpio.read_pin(12)}")
     
     # Test edge detection
     def callback(channel):
@@ -25,7 +30,18 @@ try:
     print("Edge detection added successfully!")
     
     print("Monitoring for 5 seconds...")
-    time.sleep(5)
+    if fastgpio.available():
+        # Sample the level register alongside the callbacks and report changes
+        last = fastgpio.read_pin(12)
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            level = fastgpio.read_pin(12)
+            if level != last:
+                print(f"Pin 12 level -> {level}")
+                last = level
+            time.sleep(0.001)
+    else:
+        time.sleep(5)
     
     GPIO.remove_event_detect(12)
     print("Test completed successfully!")
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import RPi.GPIO as GPIO
 
+import fastgpio
+
 GPIO.setmode(GPIO.BCM)
 print("Testing pin 17 directly...")
 
@@ -10,6 +12,9 @@ try:
     
     state = GPIO.input(17)
     print(f"Pin 17 state: {state}")
+    if fastgpio.available():
+        # Same level straight from GPLEV0; a mismatch means RPi.GPIO is out of sync
+        print(f"Pin 17 register level: {fastgpio.read_pin(17)}")
     
     GPIO.add_event_detect(17, GPIO.BOTH)
     print("Pin 17 edge detection: OK")
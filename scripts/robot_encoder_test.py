@@ -4,14 +4,8 @@ Test script using the robot's actual Encoder class
 """
 
 import sys
-import os
 
-# Add src directory to path
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-ROOT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
-SRC_DIR = os.path.join(ROOT_DIR, 'src')
-if SRC_DIR not in sys.path:
-    sys.path.insert(0, SRC_DIR)
+import _bootstrap  # Puts src/ on sys.path
 
 try:
     import RPi.GPIO as GPIO
@@ -44,12 +38,18 @@ def main():
         print("Monitor for 5 seconds...")
         
         import time
-        start_time = time.time()
-        while time.time() - start_time < 5:
-            left_count = left_encoder.get_count()
-            right_count = right_encoder.get_count()
-            print(f"Left: {left_count}, Right: {right_count}", end='\r')
-            time.sleep(0.1)
+        deadline_ns = time.monotonic_ns() + 5_000_000_000
+        next_sample_ns = time.monotonic_ns()
+        last_counts = None
+        out = sys.stdout.buffer
+        while (now := time.monotonic_ns()) < deadline_ns:
+            counts = (left_encoder.get_count(), right_encoder.get_count())
+            if counts != last_counts:
+                out.write(b'\rLeft: %8d, Right: %8d' % counts)
+                out.flush()
+                last_counts = counts
+            next_sample_ns += 100_000_000
+            time.sleep(max(0, next_sample_ns - time.monotonic_ns()) / 1e9)
         
         print(f"\nFinal - Left: {left_encoder.get_count()}, Right: {right_encoder.get_count()}")
         
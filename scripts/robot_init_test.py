@@ -3,16 +3,9 @@
 Test script that mimics robot initialization sequence to isolate GPIO issue
 """
 
-import sys
-import os
 import logging
 
-# Add src directory to path
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-ROOT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
-SRC_DIR = os.path.join(ROOT_DIR, 'src')
-if SRC_DIR not in sys.path:
-    sys.path.insert(0, SRC_DIR)
+import _bootstrap  # Puts src/ on sys.path
 
 # Import robot modules in the same order as the robot
 print("=== Robot Initialization Sequence Test ===")
@@ -25,7 +18,7 @@ logging.getLogger("core.slam").setLevel(logging.WARNING)
 
 print("2. Loading configuration...")
 from core.config_manager import ConfigManager
-config = ConfigManager()
+config = ConfigManager.instance()
 
 print("3. Importing robot modules...")
 from core.robot import Robot
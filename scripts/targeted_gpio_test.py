@@ -3,15 +3,8 @@
 Targeted test to identify the exact point where GPIO edge detection fails in robot context
 """
 
-import sys
-import os
 
-# Add src directory to path
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-ROOT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
-SRC_DIR = os.path.join(ROOT_DIR, 'src')
-if SRC_DIR not in sys.path:
-    sys.path.insert(0, SRC_DIR)
+import _bootstrap  # Puts src/ on sys.path
 
 import RPi.GPIO as GPIO
 
@@ -49,7 +42,7 @@ def test_encoder_with_robot_imports():
     
     # Setup minimal environment
     setup_logging()
-    config = ConfigManager()
+    config = ConfigManager.instance()
     
     GPIO.cleanup()
     
@@ -84,17 +77,27 @@ def test_encoder_step_by_step():
     print(f"   Pin 17 state: {state}")
     
     print("3. Creating callback function...")
+    import threading
+    import time
+    fired = threading.Event()
     def test_callback(channel):
         print(f"   Callback triggered on channel {channel}")
+        fired.set()
     
     print("4. Adding edge detection...")
     try:
         GPIO.add_event_detect(17, GPIO.BOTH, callback=test_callback)
         print("   ✓ Edge detection added successfully")
         
-        print("5. Testing for 2 seconds...")
-        import time
-        time.sleep(2)
+        # The callback stays armed; the wait ends as soon as it fires
+        print("5. Waiting up to 2 seconds for the callback...")
+        start_ns = time.monotonic_ns()
+        fired.wait(timeout=2.0)
+        waited_ms = (time.monotonic_ns() - start_ns) / 1e6
+        if fired.is_set():
+            print(f"   ✓ Callback delivered after {waited_ms:.3f} ms")
+        else:
+            print(f"   No callback within {waited_ms:.0f} ms (move the wheel to test delivery)")
         
         print("6. Removing edge detection...")
         GPIO.remove_event_detect(17)
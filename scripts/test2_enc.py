@@ -1,5 +1,4 @@
 from core.motors import MotorController
-import yaml
 
 motor_config = {}
 try:
@@ -4,11 +4,15 @@ Communication Manager for Ruohobot
 Handles WiFi communication, remote control, and telemetry.
 """
 
+import gzip
 import logging
 import json
+import os
 import time
 import threading
-from typing import Dict, Any, Callable, Optional
+from types import MappingProxyType
+from urllib.parse import parse_qs, urlsplit
+from typing import Dict, Any, Callable, Optional, Tuple
 try:
     import socket
     import socketserver
@@ -17,20 +21,272 @@ try:
 except ImportError:
     NETWORKING_AVAILABLE = False
 
-import cv2
-from flask import Response, jsonify
-from core.slam import SLAMSystem
-
-# Ensure compatibility with Raspberry Pi OS
+# orjson encodes straight to bytes and decodes bytes without a str copy;
+# fall back to the stdlib json module when it is not installed
 try:
-    import cv2
+    import orjson
+    
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    
+    _loads = orjson.loads
 except ImportError:
-    raise ImportError("OpenCV is not installed. Install it using 'sudo apt install python3-opencv'.")
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    
+    def _loads(data: bytes):
+        return json.loads(data.decode())
 
-try:
-    from flask import Response, jsonify
-except ImportError:
-    raise ImportError("Flask is not installed. Install it using 'pip3 install flask'.")
+logger = logging.getLogger(__name__)
+
+# OpenCV and the SLAM stack (numpy, cv2) are imported where they are used so
+# that importing this module stays cheap for scripts that never touch the map.
+
+# Socket send buffer for the HTTP listener; accepted connections inherit it, so
+# a SLAM map PNG fits without partial-write loops
+HTTP_SNDBUF = 256 * 1024
+
+# Status line and headers shared by every 200 JSON reply; the Content-Length
+# is filled in per response, extra headers and the blank line follow
+_JSON_OK_HEAD = (
+    b'HTTP/1.0 200 OK\r\n'
+    b'Content-type: application/json\r\n'
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Content-Length: %d\r\n'
+)
+_STATUS_VERSION_HEADERS = (
+    b'Access-Control-Expose-Headers: X-Telemetry-Version\r\n'
+    b'X-Telemetry-Version: %d\r\n'
+)
+_COMMAND_OK_BODY = b'{"status":"ok","message":"Command received"}'
+
+# The HTTP server handles one connection at a time, so a client that stalls
+# mid-request must not hold it: per-connection socket timeout and body cap
+HTTP_CLIENT_TIMEOUT = 5.0
+MAX_COMMAND_BODY = 4096
+
+# Command bodies up to this size are remembered, already parsed, so repeated
+# WASD keypresses (identical JSON bodies) skip the JSON decode
+COMMAND_CACHE_MAX_BODY = 256
+COMMAND_CACHE_SIZE = 32
+
+
+def _freeze(value):
+    """Read-only copy of a decoded JSON value, safe to hand to every caller"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Commands the web UI's buttons and WASD keys send. JSON.stringify produces
+# these exact bytes, so they are recognised without decoding any JSON.
+_UI_COMMANDS = [
+    {'type': 'state_change', 'data': state} for state in ('manual_control', 'autonomous', 'idle')
+] + [
+    {'type': 'move', 'data': {'speed': speed, 'direction': direction}}
+    for speed, direction in ((300, 0), (-300, 0), (0, 0), (400, 0), (-400, 0), (0, -400), (0, 400))
+] + [
+    {'type': 'navigation', 'data': mode} for mode in ('explore', 'return_home')
+] + [
+    {'type': 'emergency_stop', 'data': None},
+]
+_UI_COMMAND_BODIES = {json.dumps(command, separators=(',', ':')).encode(): _freeze(command)
+                      for command in _UI_COMMANDS}
+
+# Web UI page, encoded and gzip-compressed once at import
+_MAIN_PAGE_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Ruohobot Control</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background: #f0f0f0; }
+        .container { max-width: 800px; margin: 0 auto; background: white; padding: 20px; border-radius: 10px; }
+        .status { background: #e8f5e8; padding: 15px; border-radius: 5px; margin: 10px 0; }
+        .controls { display: grid; grid-template-columns: repeat(3, 1fr); gap: 10px; margin: 20px 0; }
+        button { padding: 15px; font-size: 16px; border: none; border-radius: 5px; cursor: pointer; }
+        .btn-primary { background: #007bff; color: white; }
+        .btn-danger { background: #dc3545; color: white; }
+        .btn-success { background: #28a745; color: white; }
+        .btn-warning { background: #ffc107; color: black; }
+        #status-data { font-family: monospace; font-size: 12px; }
+        .slam-visualization { margin-top: 30px; }
+        .slam-visualization img { width: 100%; border: 1px solid #ccc; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>🤖 Ruohobot Control Panel</h1>
+        
+        <div class="status">
+            <h3>Robot Status</h3>
+            <div id="status-data">Loading...</div>
+        </div>
+        
+        <div class="controls">
+            <button class="btn-primary" onclick="sendCommand('state_change', 'manual_control')">Manual Control</button>
+            <button class="btn-success" onclick="sendCommand('state_change', 'autonomous')">Start Autonomous</button>
+            <button class="btn-warning" onclick="sendCommand('state_change', 'idle')">Stop/Idle</button>
+            
+            <button class="btn-primary" onclick="sendCommand('move', {speed: 300, direction: 0})">Forward</button>
+            <button class="btn-primary" onclick="sendCommand('move', {speed: -300, direction: 0})">Backward</button>
+            <button class="btn-primary" onclick="sendCommand('move', {speed: 0, direction: 0})">Stop Motors</button>
+            
+            <button class="btn-warning" onclick="sendCommand('navigation', 'explore')">Explore Mode</button>
+            <button class="btn-warning" onclick="sendCommand('navigation', 'return_home')">Return Home</button>
+            <button class="btn-danger" onclick="sendCommand('emergency_stop', null)">EMERGENCY STOP</button>
+        </div>
+        
+        <div class="status">
+            <h3>Manual Controls</h3>
+            <p><strong>Click this area and use WASD keys:</strong></p>
+            <div id="control-area" tabindex="0" style="border: 2px solid #007bff; padding: 20px; background: #f8f9fa; border-radius: 5px; text-align: center; font-weight: bold; cursor: pointer;" onclick="this.focus()">
+                <p>🎮 WASD Control Zone - Click to Focus</p>
+                <div style="margin-top: 10px;">
+                    <div>W - Forward</div>
+                    <div>S - Backward</div>
+                    <div>A - Turn Left</div>
+                    <div>D - Turn Right</div>
+                    <div>Space - Stop</div>
+                </div>
+            </div>
+            <p style="color: #666; font-size: 12px; margin-top: 10px;">Make sure robot is in Manual Control mode first!</p>
+        </div>
+        
+        <div class="slam-visualization">
+            <h3>SLAM Map</h3>
+            <img id="slam-map" src="/api/slam_map" alt="SLAM Map" style="width: 100%; border: 1px solid #ccc;">
+        </div>
+    </div>
+    
+    <script>
+        function sendCommand(type, data) {
+            fetch('/api/command', {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({type: type, data: data})
+            })
+            .then(response => response.json())
+            .then(data => console.log('Command sent:', data))
+            .catch(error => console.error('Error:', error));
+        }
+        
+        // Only keys changed since telemetryVersion are sent; merge them locally
+        let telemetry = {};
+        let telemetryVersion = 0;
+        
+        function updateStatus() {
+            fetch('/status?since=' + telemetryVersion)
+            .then(response => {
+                telemetryVersion = parseInt(response.headers.get('X-Telemetry-Version')) || 0;
+                return response.json();
+            })
+            .then(data => {
+                Object.assign(telemetry, data);
+                document.getElementById('status-data').innerHTML = 
+                    '<pre>' + JSON.stringify(telemetry, null, 2) + '</pre>';
+            })
+            .catch(error => console.error('Status update error:', error));
+        }
+        
+        function updateSlamMap() {
+            document.getElementById('slam-map').src = '/api/slam_map?' + new Date().getTime();
+        }
+        
+        // Keyboard controls - enhanced with better focus handling
+        document.addEventListener('keydown', function(event) {
+            // Prevent default behavior for WASD and space to avoid page scrolling
+            if (['w', 'a', 's', 'd', ' '].includes(event.key.toLowerCase())) {
+                event.preventDefault();
+            }
+            
+            switch(event.key.toLowerCase()) {
+                case 'w': 
+                    sendCommand('move', {speed: 400, direction: 0}); 
+                    console.log('W pressed - Forward');
+                    break;
+                case 's': 
+                    sendCommand('move', {speed: -400, direction: 0}); 
+                    console.log('S pressed - Backward');
+                    break;
+                case 'a': 
+                    sendCommand('move', {speed: 0, direction: -400}); 
+                    console.log('A pressed - Turn Left');
+                    break;
+                case 'd': 
+                    sendCommand('move', {speed: 0, direction: 400}); 
+                    console.log('D pressed - Turn Right');
+                    break;
+                case ' ': 
+                    sendCommand('move', {speed: 0, direction: 0}); 
+                    console.log('Space pressed - Stop');
+                    break;
+            }
+        });
+        
+        // Add visual feedback for the control area
+        const controlArea = document.getElementById('control-area');
+        if (controlArea) {
+            controlArea.addEventListener('focus', function() {
+                this.style.backgroundColor = '#e7f3ff';
+                this.innerHTML = '<p>🎮 WASD Control Zone - ACTIVE</p><div style="margin-top: 10px;"><div>W - Forward</div><div>S - Backward</div><div>A - Turn Left</div><div>D - Turn Right</div><div>Space - Stop</div></div>';
+            });
+            
+            controlArea.addEventListener('blur', function() {
+                this.style.backgroundColor = '#f8f9fa';
+                this.innerHTML = '<p>🎮 WASD Control Zone - Click to Focus</p><div style="margin-top: 10px;"><div>W - Forward</div><div>S - Backward</div><div>A - Turn Left</div><div>D - Turn Right</div><div>Space - Stop</div></div>';
+            });
+        }
+        
+        // Update status and SLAM map every 2 seconds
+        setInterval(() => {
+            updateStatus();
+            updateSlamMap();
+        }, 2000);
+        updateStatus(); // Initial load
+        updateSlamMap(); // Initial map load
+    </script>
+</body>
+</html>
+        """
+_MAIN_PAGE_BYTES = _MAIN_PAGE_HTML.encode('utf-8')
+_MAIN_PAGE_GZIP = gzip.compress(_MAIN_PAGE_BYTES, 6)
+
+# Complete GET / responses (status line + headers + body), matching the
+# handler's HTTP/1.0 protocol_version, so serving the page is a single write
+_MAIN_PAGE_RESPONSE = (
+    b'HTTP/1.0 200 OK\r\n'
+    b'Content-type: text/html\r\n'
+    b'Content-Length: %d\r\n'
+    b'\r\n' % len(_MAIN_PAGE_BYTES)
+) + _MAIN_PAGE_BYTES
+_MAIN_PAGE_GZIP_RESPONSE = (
+    b'HTTP/1.0 200 OK\r\n'
+    b'Content-type: text/html\r\n'
+    b'Content-Encoding: gzip\r\n'
+    b'Content-Length: %d\r\n'
+    b'\r\n' % len(_MAIN_PAGE_GZIP)
+) + _MAIN_PAGE_GZIP
+
+
+def _create_page_file():
+    """
+    Put both prebuilt GET / responses (plain, then gzip) in an in-memory file
+    
+    The handler sends them with socket.sendfile(), so the kernel copies the
+    page straight from the memfd to the socket. Returns None where memfd_create
+    is unavailable (non-Linux); the handler then writes the bytes itself.
+    """
+    try:
+        fd = os.memfd_create('ruohobot_main_page')
+    except (AttributeError, OSError):
+        return None
+    page_file = os.fdopen(fd, 'w+b')
+    page_file.write(_MAIN_PAGE_RESPONSE + _MAIN_PAGE_GZIP_RESPONSE)
+    page_file.flush()
+    return page_file
 
 
 class CommunicationManager:
@@ -38,7 +294,7 @@ class CommunicationManager:
     
     def __init__(self, config: Dict[str, Any]):
         """Initialize communication manager"""
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.config = config
         
         # Configuration
@@ -51,10 +307,17 @@ class CommunicationManager:
         # Telemetry data
         self.telemetry_data = {}
         self.last_telemetry_update = time.time()
+        self._next_telemetry_update = 0.0   # time.monotonic() deadline for the 1 Hz refresh
+        # (version, telemetry JSON, /api envelope), encoded once per change and shared by requests
+        self._telemetry_snapshot: Optional[Tuple[int, bytes, bytes]] = None
+        self._telemetry_version = 0                     # Bumped on every telemetry change
+        self._key_versions: Dict[str, int] = {}         # Version at which each key last changed
+        self._command_cache: Dict[bytes, Any] = {}
         
         # HTTP server for web interface
         self.http_server = None
         self.server_thread = None
+        self._page_file = None
         
         # Status
         self.is_running = False
@@ -63,6 +326,7 @@ class CommunicationManager:
         # Initialize LiDAR and SLAM system (load config like other sensors)
         try:
             from core.lidar import LidarManager
+            from core.slam import SLAMSystem
             lidar_config = None
             # Prefer 'lidar' section, else try sensors.distance_scanner as fallback
             if 'lidar' in config:
@@ -109,11 +373,13 @@ class CommunicationManager:
         if not self.is_running:
             return
         
-        # Update telemetry periodically
-        current_time = time.time()
-        if current_time - self.last_telemetry_update > 1.0:  # Every second
-            self._update_telemetry()
-            self.last_telemetry_update = current_time
+        # Update telemetry periodically; most ticks only compare one float
+        now = time.monotonic()
+        if now < self._next_telemetry_update:
+            return
+        self._next_telemetry_update = now + 1.0  # Every second
+        self._update_telemetry()
+        self.last_telemetry_update = time.time()
     
     def _start_http_server(self):
         """Start HTTP server for web interface"""
@@ -125,10 +391,25 @@ class CommunicationManager:
             comm_manager = self
             
             class RobotHTTPHandler(BaseHTTPRequestHandler):
+                # Buffer wfile so the status line, headers and a small body go
+                # out in one send() when the request finishes (0 = unbuffered,
+                # one syscall per write)
+                wbufsize = -1
+                # TCP_NODELAY on each accepted connection: small JSON replies
+                # are not held back by Nagle's algorithm
+                disable_nagle_algorithm = True
+                # Reads and writes on a stalled connection give up after this
+                timeout = HTTP_CLIENT_TIMEOUT
+                
+                def _send_json_ok(self, body: bytes, extra_headers: bytes = b''):
+                    # Prebuilt header bytes instead of send_response/send_header,
+                    # which format a Date header and each line on every request
+                    self.wfile.write(_JSON_OK_HEAD % len(body) + extra_headers + b'\r\n' + body)
+                
                 def do_GET(self):
                     if self.path == '/':
                         self._serve_main_page()
-                    elif self.path == '/status':
+                    elif self.path == '/status' or self.path.startswith('/status?'):
                         self._serve_status()
                     elif self.path == '/api/slam_map':
                         self._serve_slam_map()
@@ -141,6 +422,7 @@ class CommunicationManager:
                     try:
                         if comm_manager.slam is None:
                             raise RuntimeError("SLAM system not initialized")
+                        import cv2
                         slam_map = comm_manager.slam.get_map_image(add_robot_pose=True)
                         _, buffer = cv2.imencode('.png', slam_map)
                         self.send_response(200)
@@ -154,60 +436,60 @@ class CommunicationManager:
                         self.send_header('Content-type', 'application/json')
                         self.end_headers()
                         response = {"status": "error", "message": str(e)}
-                        self.wfile.write(json.dumps(response).encode())
+                        self.wfile.write(_dumps(response))
                 
                 def do_POST(self):
-                    comm_manager.logger.info(f"POST request to {self.path}")
+                    comm_manager.logger.debug("POST request to %s", self.path)
                     if self.path.startswith('/api/'):
                         self._handle_api_post()
                     else:
                         self._serve_404()
                 
                 def _serve_main_page(self):
-                    html = comm_manager._get_main_page_html()
-                    self.send_response(200)
-                    self.send_header('Content-type', 'text/html')
-                    self.end_headers()
-                    self.wfile.write(html.encode())
+                    # Prebuilt response bytes; bypasses send_response/send_header
+                    if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                        response, offset = _MAIN_PAGE_GZIP_RESPONSE, len(_MAIN_PAGE_RESPONSE)
+                    else:
+                        response, offset = _MAIN_PAGE_RESPONSE, 0
+                    page_file = comm_manager._page_file
+                    if page_file is not None:
+                        self.wfile.flush()
+                        self.connection.sendfile(page_file, offset, len(response))
+                    else:
+                        self.wfile.write(response)
                 
                 def _serve_status(self):
-                    self.send_response(200)
-                    self.send_header('Content-type', 'application/json')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    json_data = json.dumps(comm_manager.telemetry_data)
-                    self.wfile.write(json_data.encode())
+                    # /status?since=N returns only the keys changed after version N
+                    query = parse_qs(urlsplit(self.path).query)
+                    try:
+                        since = int(query.get('since', ['0'])[0])
+                    except ValueError:
+                        since = 0
+                    version, body = comm_manager.get_telemetry_delta(since)
+                    self._send_json_ok(body, _STATUS_VERSION_HEADERS % version)
                 
                 def _handle_api_get(self):
-                    self.send_response(200)
-                    self.send_header('Content-type', 'application/json')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    response = {"status": "ok", "data": comm_manager.telemetry_data}
-                    self.wfile.write(json.dumps(response).encode())
+                    self._send_json_ok(comm_manager.get_telemetry_snapshot()[2])
                 
                 def _handle_api_post(self):
-                    comm_manager.logger.info(f"Handling API POST to {self.path}")
-                    content_length = int(self.headers['Content-Length'])
+                    # Single header lookup; a missing length means an empty body
+                    content_length = int(self.headers.get('Content-Length') or 0)
+                    if content_length > MAX_COMMAND_BODY:
+                        self.send_error(413, "Command body too large")
+                        return
                     post_data = self.rfile.read(content_length)
                     
                     try:
-                        command = json.loads(post_data.decode())
+                        command = comm_manager._parse_command(post_data)
                         comm_manager._handle_command(command)
-                        
-                        self.send_response(200)
-                        self.send_header('Content-type', 'application/json')
-                        self.send_header('Access-Control-Allow-Origin', '*')
-                        self.end_headers()
-                        response = {"status": "ok", "message": "Command received"}
-                        self.wfile.write(json.dumps(response).encode())
+                        self._send_json_ok(_COMMAND_OK_BODY)
                         
                     except Exception as e:
                         self.send_response(400)
                         self.send_header('Content-type', 'application/json')
                         self.end_headers()
                         response = {"status": "error", "message": str(e)}
-                        self.wfile.write(json.dumps(response).encode())
+                        self.wfile.write(_dumps(response))
                 
                 def _serve_404(self):
                     self.send_response(404)
@@ -219,8 +501,11 @@ class CommunicationManager:
                     # Suppress default HTTP server logging
                     pass
             
+            self._page_file = _create_page_file()
+            
             # Start server in separate thread
             self.http_server = HTTPServer(('0.0.0.0', self.telemetry_port), RobotHTTPHandler)
+            self.http_server.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, HTTP_SNDBUF)
             self.server_thread = threading.Thread(target=self.http_server.serve_forever)
             self.server_thread.daemon = True
             self.server_thread.start()
@@ -232,165 +517,34 @@ class CommunicationManager:
             self.logger.error(f"Failed to start HTTP server: {e}")
             self.wifi_enabled = False
     
-    def _get_main_page_html(self) -> str:
-        """Generate main web interface HTML"""
-        return """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Ruohobot Control</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; background: #f0f0f0; }
-        .container { max-width: 800px; margin: 0 auto; background: white; padding: 20px; border-radius: 10px; }
-        .status { background: #e8f5e8; padding: 15px; border-radius: 5px; margin: 10px 0; }
-        .controls { display: grid; grid-template-columns: repeat(3, 1fr); gap: 10px; margin: 20px 0; }
-        button { padding: 15px; font-size: 16px; border: none; border-radius: 5px; cursor: pointer; }
-        .btn-primary { background: #007bff; color: white; }
-        .btn-danger { background: #dc3545; color: white; }
-        .btn-success { background: #28a745; color: white; }
-        .btn-warning { background: #ffc107; color: black; }
-        #status-data { font-family: monospace; font-size: 12px; }
-        .slam-visualization { margin-top: 30px; }
-        .slam-visualization img { width: 100%; border: 1px solid #ccc; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🤖 Ruohobot Control Panel</h1>
-        
-        <div class="status">
-            <h3>Robot Status</h3>
-            <div id="status-data">Loading...</div>
-        </div>
-        
-        <div class="controls">
-            <button class="btn-primary" onclick="sendCommand('state_change', 'manual_control')">Manual Control</button>
-            <button class="btn-success" onclick="sendCommand('state_change', 'autonomous')">Start Autonomous</button>
-            <button class="btn-warning" onclick="sendCommand('state_change', 'idle')">Stop/Idle</button>
-            
-            <button class="btn-primary" onclick="sendCommand('move', {speed: 300, direction: 0})">Forward</button>
-            <button class="btn-primary" onclick="sendCommand('move', {speed: -300, direction: 0})">Backward</button>
-            <button class="btn-primary" onclick="sendCommand('move', {speed: 0, direction: 0})">Stop Motors</button>
-            
-            <button class="btn-warning" onclick="sendCommand('navigation', 'explore')">Explore Mode</button>
-            <button class="btn-warning" onclick="sendCommand('navigation', 'return_home')">Return Home</button>
-            <button class="btn-danger" onclick="sendCommand('emergency_stop', null)">EMERGENCY STOP</button>
-        </div>
-        
-        <div class="status">
-            <h3>Manual Controls</h3>
-            <p><strong>Click this area and use WASD keys:</strong></p>
-            <div id="control-area" tabindex="0" style="border: 2px solid #007bff; padding: 20px; background: #f8f9fa; border-radius: 5px; text-align: center; font-weight: bold; cursor: pointer;" onclick="this.focus()">
-                <p>🎮 WASD Control Zone - Click to Focus</p>
-                <div style="margin-top: 10px;">
-                    <div>W - Forward</div>
-                    <div>S - Backward</div>
-                    <div>A - Turn Left</div>
-                    <div>D - Turn Right</div>
-                    <div>Space - Stop</div>
-                </div>
-            </div>
-            <p style="color: #666; font-size: 12px; margin-top: 10px;">Make sure robot is in Manual Control mode first!</p>
-        </div>
-        
-        <div class="slam-visualization">
-            <h3>SLAM Map</h3>
-            <img id="slam-map" src="/api/slam_map" alt="SLAM Map" style="width: 100%; border: 1px solid #ccc;">
-        </div>
-    </div>
-    
-    <script>
-        function sendCommand(type, data) {
-            fetch('/api/command', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({type: type, data: data})
-            })
-            .then(response => response.json())
-            .then(data => console.log('Command sent:', data))
-            .catch(error => console.error('Error:', error));
-        }
-        
-        function updateStatus() {
-            fetch('/status')
-            .then(response => response.json())
-            .then(data => {
-                document.getElementById('status-data').innerHTML = 
-                    '<pre>' + JSON.stringify(data, null, 2) + '</pre>';
-            })
-            .catch(error => console.error('Status update error:', error));
-        }
-        
-        function updateSlamMap() {
-            document.getElementById('slam-map').src = '/api/slam_map?' + new Date().getTime();
-        }
-        
-        // Keyboard controls - enhanced with better focus handling
-        document.addEventListener('keydown', function(event) {
-            // Prevent default behavior for WASD and space to avoid page scrolling
-            if (['w', 'a', 's', 'd', ' '].includes(event.key.toLowerCase())) {
-                event.preventDefault();
-            }
-            
-            switch(event.key.toLowerCase()) {
-                case 'w': 
-                    sendCommand('move', {speed: 400, direction: 0}); 
-                    console.log('W pressed - Forward');
-                    break;
-                case 's': 
-                    sendCommand('move', {speed: -400, direction: 0}); 
-                    console.log('S pressed - Backward');
-                    break;
-                case 'a': 
-                    sendCommand('move', {speed: 0, direction: -400}); 
-                    console.log('A pressed - Turn Left');
-                    break;
-                case 'd': 
-                    sendCommand('move', {speed: 0, direction: 400}); 
-                    console.log('D pressed - Turn Right');
-                    break;
-                case ' ': 
-                    sendCommand('move', {speed: 0, direction: 0}); 
-                    console.log('Space pressed - Stop');
-                    break;
-            }
-        });
-        
-        // Add visual feedback for the control area
-        const controlArea = document.getElementById('control-area');
-        if (controlArea) {
-            controlArea.addEventListener('focus', function() {
-                this.style.backgroundColor = '#e7f3ff';
-                this.innerHTML = '<p>🎮 WASD Control Zone - ACTIVE</p><div style="margin-top: 10px;"><div>W - Forward</div><div>S - Backward</div><div>A - Turn Left</div><div>D - Turn Right</div><div>Space - Stop</div></div>';
-            });
-            
-            controlArea.addEventListener('blur', function() {
-                this.style.backgroundColor = '#f8f9fa';
-                this.innerHTML = '<p>🎮 WASD Control Zone - Click to Focus</p><div style="margin-top: 10px;"><div>W - Forward</div><div>S - Backward</div><div>A - Turn Left</div><div>D - Turn Right</div><div>Space - Stop</div></div>';
-            });
-        }
+    def _parse_command(self, body: bytes) -> Any:
+        """
+        Decode a command POST body, reusing the result for repeated identical bodies
         
-        // Update status and SLAM map every 2 seconds
-        setInterval(() => {
-            updateStatus();
-            updateSlamMap();
-        }, 2000);
-        updateStatus(); // Initial load
-        updateSlamMap(); // Initial map load
-    </script>
-</body>
-</html>
+        Cached commands are shared between calls, so they are stored read-only
+        (nested MappingProxyType); larger bodies are decoded fresh every time.
         """
+        command = _UI_COMMAND_BODIES.get(body)
+        if command is None:
+            command = self._command_cache.get(body)
+        if command is None:
+            command = _loads(body)
+            if len(body) <= COMMAND_CACHE_MAX_BODY:
+                if len(self._command_cache) >= COMMAND_CACHE_SIZE:
+                    self._command_cache.clear()
+                command = _freeze(command)
+                self._command_cache[body] = command
+        return command
     
     def _handle_command(self, command: Dict[str, Any]):
         """Handle received command"""
-        self.logger.info(f"Received command: {command}")
+        # Runs for every keypress; lazy %-style args are only formatted when
+        # debug logging is on
+        self.logger.debug("Received command: %s", command)
         
         if self.command_callback:
-            self.logger.info(f"Command callback exists, calling it with: {command}")
             try:
                 self.command_callback(command)
-                self.logger.info("Command callback executed successfully")
             except Exception as e:
                 self.logger.error(f"Error executing command: {e}")
         else:
@@ -399,7 +553,7 @@ class CommunicationManager:
     def _update_telemetry(self):
         """Update telemetry data"""
         # This will be populated by the robot's main systems
-        self.telemetry_data.update({
+        self.update_telemetry({
             'timestamp': time.time(),
             'uptime': time.time() - self.start_time,
             'communication_status': 'active' if self.is_running else 'inactive'
@@ -407,7 +561,59 @@ class CommunicationManager:
     
     def update_telemetry(self, data: Dict[str, Any]):
         """Update telemetry with new data"""
-        self.telemetry_data.update(data)
+        # The robot loop pushes telemetry every tick, mostly unchanged; only a
+        # real change invalidates the encoded JSON
+        telemetry = self.telemetry_data
+        version = self._telemetry_version + 1
+        changed = False
+        for key, value in data.items():
+            if key not in telemetry or telemetry[key] != value:
+                telemetry[key] = value
+                self._key_versions[key] = version
+                changed = True
+        if changed:
+            self._telemetry_version = version
+    
+    def get_telemetry_snapshot(self) -> Tuple[int, bytes, bytes]:
+        """
+        Get the encoded telemetry for the current version
+        
+        Encoded on the first request after a change and shared by every
+        endpoint until the next change.
+        
+        Returns:
+            Tuple of (version, UTF-8 JSON of all telemetry, /api response body)
+        """
+        snapshot = self._telemetry_snapshot
+        version = self._telemetry_version
+        if snapshot is None or snapshot[0] != version:
+            encoded = _dumps(self.telemetry_data)
+            snapshot = (version, encoded, b'{"status":"ok","data":' + encoded + b'}')
+            self._telemetry_snapshot = snapshot
+        return snapshot
+    
+    def get_telemetry_json(self) -> bytes:
+        """Get telemetry as UTF-8 JSON, encoded at most once per telemetry update"""
+        return self.get_telemetry_snapshot()[1]
+    
+    def get_telemetry_delta(self, since: int) -> Tuple[int, bytes]:
+        """
+        Get telemetry keys changed after version `since`
+        
+        Args:
+            since: Version the client last saw (0 for a full snapshot)
+        
+        Returns:
+            Tuple of (current version, UTF-8 JSON of the changed keys)
+        """
+        version = self._telemetry_version
+        if since <= 0 or since > version:
+            # New client, or a version from before a restart: send everything
+            return self.get_telemetry_snapshot()[:2]
+        telemetry = self.telemetry_data
+        changed = {key: telemetry[key] for key, key_version in list(self._key_versions.items())
+                   if key_version > since}
+        return version, _dumps(changed)
     
     def send_message(self, message: str):
         """Send message (placeholder for future implementation)"""
@@ -437,6 +643,10 @@ class CommunicationManager:
         if self.server_thread and self.server_thread.is_alive():
             self.server_thread.join(timeout=2.0)
         
+        if self._page_file is not None:
+            self._page_file.close()
+            self._page_file = None
+        
         self.logger.info("Communication system shutdown complete")
     
 
@@ -4,18 +4,33 @@ Configuration Manager
 Handles loading and managing configuration from YAML files.
 """
 
+import copy
+import json
+import os
 import yaml
 import logging
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# libyaml's C parser when PyYAML was built with it; same semantics as safe_load
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 
 class ConfigManager:
     """Manages robot configuration"""
     
+    # Parsed configs shared by all instances: path -> ((mtime_ns, size), config)
+    _parse_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+    
+    # Shared managers for instance(): path -> ((mtime_ns, size), ConfigManager)
+    _instances: Dict[str, Tuple[Tuple[int, int], 'ConfigManager']] = {}
+    
     def __init__(self, config_path: str = None):
         """Initialize configuration manager"""
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         
         if config_path is None:
             config_path = Path(__file__).parent.parent.parent / "config" / "robot_config.yaml"
@@ -23,14 +38,55 @@ class ConfigManager:
         self.config_path = Path(config_path)
         self._config = self._load_config()
         
+    @classmethod
+    def instance(cls, config_path: str = None, *, refresh: bool = False) -> 'ConfigManager':
+        """
+        Get a shared ConfigManager for config_path
+        
+        The same manager is returned until the file's mtime or size changes.
+        
+        Args:
+            config_path: Path to the YAML file (default: config/robot_config.yaml)
+            refresh: Build a new manager even if the file is unchanged
+        
+        Returns:
+            Shared ConfigManager instance
+        """
+        if config_path is None:
+            config_path = Path(__file__).parent.parent.parent / "config" / "robot_config.yaml"
+        path = Path(config_path)
+        
+        try:
+            stat = path.stat()
+            version = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            version = None  # Missing file: manager falls back to defaults
+        
+        key = str(path.resolve())
+        cached = cls._instances.get(key)
+        if not refresh and cached is not None and cached[0] == version:
+            return cached[1]
+        
+        manager = cls(config_path)
+        cls._instances[key] = (version, manager)
+        return manager
+    
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file"""
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r') as f:
-                    config = yaml.safe_load(f)
+                path = str(self.config_path.resolve())
+                stat = self.config_path.stat()
+                version = (stat.st_mtime_ns, stat.st_size)
+                cached = ConfigManager._parse_cache.get(path)
+                if cached is not None and cached[0] == version:
+                    config = cached[1]
+                else:
+                    config = self._read_config(stat.st_mtime_ns)
+                    ConfigManager._parse_cache[path] = (version, config)
                 self.logger.info(f"Configuration loaded from {self.config_path}")
-                return config
+                # Each instance gets its own copy so edits don't leak between managers
+                return copy.deepcopy(config)
             else:
                 self.logger.warning(f"Config file {self.config_path} not found, using defaults")
                 return self._get_default_config()
@@ -38,6 +94,41 @@ class ConfigManager:
             self.logger.error(f"Error loading config: {e}")
             return self._get_default_config()
     
+    def _read_config(self, mtime_ns: int) -> Dict[str, Any]:
+        """
+        Read the config file through its JSON sidecar
+        
+        <name>.cached.json holds the parsed YAML and carries the YAML
+        file's mtime, so it is only used while the YAML is unchanged. If the
+        sidecar can't be written (e.g. read-only filesystem), the YAML is parsed
+        every time.
+        
+        Args:
+            mtime_ns: Modification time of the YAML file in nanoseconds
+        
+        Returns:
+            Parsed configuration
+        """
+        cache_path = self.config_path.with_name(self.config_path.stem + '.cached.json')
+        try:
+            if cache_path.stat().st_mtime_ns == mtime_ns:
+                return json.loads(cache_path.read_bytes())
+        except (OSError, ValueError):
+            pass
+        
+        with open(self.config_path, 'r') as f:
+            config = yaml.load(f, Loader=YAML_LOADER)
+        
+        try:
+            text = json.dumps(config)
+            # Skip the sidecar if JSON can't represent the config (e.g. non-string keys)
+            if json.loads(text) == config:
+                cache_path.write_text(text)
+                os.utime(cache_path, ns=(mtime_ns, mtime_ns))
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.debug(f"Config cache not written: {e}")
+        return config
+    
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
         return {
@@ -111,35 +202,44 @@ class ConfigManager:
             }
         }
     
-    @property
+    @cached_property
     def hardware(self):
         """Get hardware configuration"""
-        return ConfigDict(self._config.get('hardware', {}))
+        return ConfigDict.wrap(self._config.get('hardware', {}))
     
-    @property
+    @cached_property
     def safety(self):
         """Get safety configuration"""
-        return ConfigDict(self._config.get('safety', {}))
+        return ConfigDict.wrap(self._config.get('safety', {}))
     
-    @property
+    @cached_property
     def navigation(self):
         """Get navigation configuration"""
-        return ConfigDict(self._config.get('navigation', {}))
+        return ConfigDict.wrap(self._config.get('navigation', {}))
     
-    @property
+    @cached_property
     def communication(self):
         """Get communication configuration"""
-        return ConfigDict(self._config.get('communication', {}))
+        return ConfigDict.wrap(self._config.get('communication', {}))
     
-    @property
+    @cached_property
     def behavior(self):
         """Get behavior configuration"""
-        return ConfigDict(self._config.get('behavior', {}))
+        return ConfigDict.wrap(self._config.get('behavior', {}))
 
 
 class ConfigDict(dict):
     """Dictionary that allows dot notation access"""
     
+    @classmethod
+    def wrap(cls, value):
+        """Convert nested dicts (also inside lists) to ConfigDict once, up front"""
+        if isinstance(value, dict):
+            return cls((key, cls.wrap(item)) for key, item in value.items())
+        if isinstance(value, list):
+            return [cls.wrap(item) for item in value]
+        return value
+    
     def __getattr__(self, key):
         try:
             return self[key]
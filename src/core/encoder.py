@@ -1,43 +1,66 @@
 """
 Encoder sensor class for Ruohobot
-Counts pulses from Omron slit-wheel encoders using GPIO interrupts.
+Counts pulses from Omron slit-wheel encoders.
+
+Edges are counted inside the pigpio daemon when it is running (sudo pigpiod),
+so no Python code runs per pulse. Without it, RPi.GPIO interrupts are used.
 """
+import logging
+import math
 import time
-import threading
+try:
+    import pigpio
+except ImportError:
+    pigpio = None
 try:
     import RPi.GPIO as GPIO
 except ImportError:
     GPIO = None
 
+logger = logging.getLogger(__name__)
+
 class Encoder:
     # Class variable to track if GPIO mode has been set
     _gpio_mode_set = False
-    
+
+    # pigpio daemon connection shared by all encoders (False once it has failed)
+    _pi = None
+
     def __init__(self, pin, pulses_per_rev, wheel_diameter):
-        if GPIO is None:
-            raise ImportError("RPi.GPIO is required for encoder support on Raspberry Pi.")
-        
         self.pin = pin
         self.pulses_per_rev = pulses_per_rev
         self.wheel_diameter = wheel_diameter
+        self._m_per_pulse = math.pi * wheel_diameter / pulses_per_rev
+        # Edges seen by the RPi.GPIO callback, which is the only writer; reset()
+        # moves the offset instead, so no lock is needed
         self.count = 0
-        self.last_time = time.time()
-        self.lock = threading.Lock()
-        
+        self._count_offset = 0
+
+        # pigpio edge counter; None when falling back to RPi.GPIO
+        self._cb = None
+        pi = Encoder._connect_pigpio()
+        if pi is not None:
+            pi.set_mode(self.pin, pigpio.INPUT)
+            pi.set_pull_up_down(self.pin, pigpio.PUD_UP)
+            self._cb = pi.callback(self.pin, pigpio.EITHER_EDGE)
+            return
+
+        if GPIO is None:
+            raise ImportError("pigpio (with pigpiod running) or RPi.GPIO is required for encoder support on Raspberry Pi.")
+
         # Only set GPIO mode once
         if not Encoder._gpio_mode_set:
             GPIO.setmode(GPIO.BCM)
             Encoder._gpio_mode_set = True
-        
+
         # Setup pin
         GPIO.setup(self.pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        
-        # Add edge detection with error handling and retry mechanism
+
+        # Add edge detection with error handling and retry mechanism; only a
+        # failed attempt waits for the pin to settle
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                # Small delay to let GPIO settle
-                time.sleep(0.1)
                 GPIO.add_event_detect(self.pin, GPIO.BOTH, callback=self._pulse_callback)
                 break  # Success, exit retry loop
             except Exception as e:
@@ -51,26 +74,41 @@ class Encoder:
                         pass
                     time.sleep(0.2)
 
+    @classmethod
+    def _connect_pigpio(cls):
+        """Get the shared pigpio connection, or None if pigpiod is unavailable"""
+        if cls._pi is None:
+            cls._pi = False
+            if pigpio is not None:
+                pi = pigpio.pi()
+                if pi.connected:
+                    cls._pi = pi
+                else:
+                    logger.info("pigpiod not running, counting encoder edges with RPi.GPIO")
+        return cls._pi or None
+
     def _pulse_callback(self, channel):
-        with self.lock:
-            self.count += 1
-            self.last_time = time.time()
+        self.count += 1
 
     def get_count(self):
-        with self.lock:
-            return self.count
+        if self._cb is not None:
+            return self._cb.tally()
+        return self.count - self._count_offset
 
     def reset(self):
-        with self.lock:
-            self.count = 0
+        if self._cb is not None:
+            self._cb.reset_tally()
+            return
+        self._count_offset = self.count
 
     def get_distance(self):
-        # Distance = (count / pulses_per_rev) * (pi * diameter)
-        with self.lock:
-            revolutions = self.count / self.pulses_per_rev
-        return revolutions * 3.141592653589793 * self.wheel_diameter
+        # Distance = count * (pi * diameter / pulses_per_rev)
+        return self.get_count() * self._m_per_pulse
 
     def cleanup(self):
+        if self._cb is not None:
+            self._cb.cancel()
+            return
         if GPIO is not None:
             try:
                 GPIO.remove_event_detect(self.pin)
@@ -5,52 +5,82 @@ Manages communication with external modules like Arduino distance scanner and No
 """
 
 import logging
+import re
+import threading
 import time
-import json
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Mapping, Optional
 try:
     import serial
     SERIAL_AVAILABLE = True
 except ImportError:
     SERIAL_AVAILABLE = False
 
+# orjson parses the sentinel's JSON straight from bytes; the stdlib json module
+# also accepts bytes and is the fallback when orjson is not installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+logger = logging.getLogger(__name__)
+
+# Distance scanner reply prefix
+DIST_PREFIX = b'DIST:'
+
+# Fixed-field sentinel reply ("T:23.5,H:65.2,L:450,M:0,B:3.7"), parsed without a
+# JSON tokenizer; JSON replies from older firmware are still accepted
+SENTINEL_FIELDS = re.compile(rb'T:(-?[\d.]+),H:([\d.]+),L:(\d+),M:([01]),B:([\d.]+)')
+
 
 class ExternalModuleManager:
     """Manages external Arduino and NodeMCU modules"""
     
     def __init__(self, config: Dict[str, Any]):
         """Initialize external module manager"""
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.config = config
         
         # Module configurations
         self.distance_scanner_config = config.get('distance_scanner', {})
         self.sentinel_config = config.get('sentinel', {})
         
-        # Serial connections
+        # Serial connections, opened on first use so boot doesn't wait on them
         self.distance_scanner_port = None
         self.sentinel_port = None
+        self._distance_scanner_init_tried = False
+        self._sentinel_init_tried = False
         
-        # Module data
-        self.distance_data = {}
-        self.sentinel_data = {}
+        # Latest module readings. Each is an immutable snapshot that the poll
+        # threads replace with a single assignment, so readers need no lock
+        self.distance_data: Mapping[str, Any] = MappingProxyType({})
+        self.sentinel_data: Mapping[str, Any] = MappingProxyType({})
         self.last_update = time.time()
         
+        # Polls are rate-limited so a fast control loop doesn't saturate the UARTs
+        self.refresh_interval = 1.0 / config.get('refresh_rate', 20.0)
+        self._next_poll = {'distance_scanner': 0.0, 'sentinel': 0.0}  # time.monotonic() deadlines
+        
+        # Connected modules are polled from background threads so a slow or
+        # stalled module never blocks the control loop
+        self.is_polling = True
+        self.poll_threads: Dict[str, threading.Thread] = {}
+        self._pending_commands: Dict[str, bytes] = {}   # Sent by the poll thread before its next poll
+        
         # Status
         self.low_power_mode = False
         
         if not SERIAL_AVAILABLE:
             self.logger.warning("Serial library not available - external modules disabled")
+            self._distance_scanner_init_tried = True
+            self._sentinel_init_tried = True
             return
         
-        # Initialize modules
-        self._init_distance_scanner()
-        self._init_sentinel()
-        
         self.logger.info("External module manager initialized")
     
     def _init_distance_scanner(self):
         """Initialize Arduino distance scanner"""
+        self._distance_scanner_init_tried = True
         if not self.distance_scanner_config.get('enabled', False):
             self.logger.info("Distance scanner disabled in config")
             return
@@ -66,6 +96,8 @@ class ExternalModuleManager:
                     timeout=1.0
                 )
                 self.logger.info(f"Distance scanner connected on {port_path}")
+                self._start_poll_thread('distance_scanner', self.distance_scanner_port,
+                                        self._poll_distance_scanner)
             else:
                 self.logger.warning("Distance scanner: serial not available")
                 
@@ -75,6 +107,7 @@ class ExternalModuleManager:
     
     def _init_sentinel(self):
         """Initialize NodeMCU sentinel module"""
+        self._sentinel_init_tried = True
         if not self.sentinel_config.get('enabled', False):
             self.logger.info("Sentinel module disabled in config")
             return
@@ -90,6 +123,7 @@ class ExternalModuleManager:
                     timeout=1.0
                 )
                 self.logger.info(f"Sentinel module connected on {port_path}")
+                self._start_poll_thread('sentinel', self.sentinel_port, self._poll_sentinel)
             else:
                 self.logger.warning("Sentinel module: serial not available")
                 
@@ -98,114 +132,169 @@ class ExternalModuleManager:
             self.sentinel_port = None
     
     def get_all_data(self) -> Dict[str, Any]:
-        """Get data from all external modules"""
+        """
+        Get data from all external modules
+        
+        Never waits on a serial port: connected modules are refreshed by their
+        poll threads and this returns the latest readings. 'stale_age' tells
+        callers how old the older of the two readings is.
+        """
         self._update_distance_scanner()
         self._update_sentinel()
         
+        # Take each snapshot once so stale_age matches the readings returned
+        distance_data = self.distance_data
+        sentinel_data = self.sentinel_data
+        oldest = min(distance_data.get('timestamp', 0.0), sentinel_data.get('timestamp', 0.0))
         return {
-            'distance_scanner': self.distance_data.copy(),
-            'sentinel': self.sentinel_data.copy(),
-            'last_update': self.last_update
+            'distance_scanner': distance_data,
+            'sentinel': sentinel_data,
+            'last_update': self.last_update,
+            'stale_age': time.time() - oldest if oldest else float('inf')
         }
     
+    def _reading(self, **fields) -> Mapping[str, Any]:
+        """
+        Build a timestamped, read-only module reading
+        
+        Readings are published by assigning the result to distance_data or
+        sentinel_data, so a reader always sees a complete reading.
+        """
+        fields['timestamp'] = self.last_update = time.time()
+        return MappingProxyType(fields)
+    
+    def _poll_due(self, module: str) -> bool:
+        """True if `module` should be polled now; schedules its next poll"""
+        now = time.monotonic()
+        if now < self._next_poll[module]:
+            return False
+        self._next_poll[module] = now + self.refresh_interval
+        return True
+    
+    def _start_poll_thread(self, module: str, port, poll: Callable[[], None]):
+        """Start the background thread that polls a connected module"""
+        thread = threading.Thread(target=self._poll_loop, args=(module, port, poll),
+                                  name=f"{module}-poll", daemon=True)
+        self.poll_threads[module] = thread
+        thread.start()
+    
+    def _poll_loop(self, module: str, port, poll: Callable[[], None]):
+        """Poll a module every refresh_interval until shutdown"""
+        next_poll = time.monotonic()
+        while self.is_polling:
+            command = self._pending_commands.pop(module, None)
+            if command is not None:
+                try:
+                    port.write(command)
+                except Exception as e:
+                    self.logger.debug("Error sending command to %s: %s", module, e)
+            
+            poll()
+            
+            next_poll += self.refresh_interval
+            delay = next_poll - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_poll = time.monotonic()  # Fell behind (e.g. read timeout); don't burst
+    
     def _update_distance_scanner(self):
         """Update data from distance scanner"""
-        if not self.distance_scanner_port:
-            # Simulate distance data for testing
-            self.distance_data = {
-                'front_distance': 2.5,  # meters
-                'left_distance': 1.8,
-                'right_distance': 3.2,
-                'rear_distance': 1.5,
-                'status': 'simulated',
-                'timestamp': time.time()
-            }
-            return
+        if self.distance_scanner_port is None and not self._distance_scanner_init_tried:
+            self._init_distance_scanner()
         
+        # A connected scanner is polled by its own thread
+        if not self.distance_scanner_port and self._poll_due('distance_scanner'):
+            # Simulate distance data for testing
+            self.distance_data = self._reading(front_distance=2.5,  # meters
+                                               left_distance=1.8,
+                                               right_distance=3.2,
+                                               rear_distance=1.5,
+                                               status='simulated')
+    
+    def _poll_distance_scanner(self):
+        """Request and parse one distance reading (runs in the poll thread)"""
         try:
             # Send request for distance data
             self.distance_scanner_port.write(b'GET_DISTANCES\n')
             
-            # Read response
-            response = self.distance_scanner_port.readline().decode().strip()
+            # Read response; parsed as bytes since float() accepts them directly
+            response = self.distance_scanner_port.readline()
             
             if response:
                 # Parse distance data (format: "DIST:1.23,2.34,3.45,4.56")
-                if response.startswith('DIST:'):
-                    distances = response[5:].split(',')
+                if response.startswith(DIST_PREFIX):
+                    distances = response[len(DIST_PREFIX):].split(b',', 4)
                     if len(distances) >= 4:
-                        self.distance_data = {
-                            'front_distance': float(distances[0]),
-                            'left_distance': float(distances[1]),
-                            'right_distance': float(distances[2]),
-                            'rear_distance': float(distances[3]),
-                            'status': 'connected',
-                            'timestamp': time.time()
-                        }
+                        self.distance_data = self._reading(front_distance=float(distances[0]),
+                                                           left_distance=float(distances[1]),
+                                                           right_distance=float(distances[2]),
+                                                           rear_distance=float(distances[3]),
+                                                           status='connected')
                 
         except Exception as e:
-            self.logger.debug(f"Distance scanner communication error: {e}")
-            self.distance_data = {
-                'status': 'error',
-                'error': str(e),
-                'timestamp': time.time()
-            }
+            self.logger.debug("Distance scanner communication error: %s", e)
+            self.distance_data = self._reading(status='error', error=str(e))
     
     def _update_sentinel(self):
         """Update data from sentinel module"""
-        if not self.sentinel_port:
-            # Simulate sentinel data for testing
-            self.sentinel_data = {
-                'temperature': 23.5,     # Celsius
-                'humidity': 65.2,        # %
-                'light_level': 450,      # lux
-                'motion_detected': False,
-                'battery_voltage': 3.7,  # V
-                'status': 'simulated',
-                'timestamp': time.time()
-            }
-            return
+        if self.sentinel_port is None and not self._sentinel_init_tried:
+            self._init_sentinel()
         
+        # A connected sentinel is polled by its own thread
+        if not self.sentinel_port and self._poll_due('sentinel'):
+            # Simulate sentinel data for testing
+            self.sentinel_data = self._reading(temperature=23.5,     # Celsius
+                                               humidity=65.2,        # %
+                                               light_level=450,      # lux
+                                               motion_detected=False,
+                                               battery_voltage=3.7,  # V
+                                               status='simulated')
+    
+    def _poll_sentinel(self):
+        """Request and parse one sentinel reading (runs in the poll thread)"""
         try:
             # Send request for sensor data
             self.sentinel_port.write(b'GET_SENSORS\n')
             
-            # Read response
-            response = self.sentinel_port.readline().decode().strip()
+            # Read response; parsed from the raw bytes without decoding
+            response = self.sentinel_port.readline().strip()
             
-            if response:
+            fields = SENTINEL_FIELDS.fullmatch(response)
+            if fields:
+                temp, humidity, light, motion, battery = fields.groups()
+                self.sentinel_data = self._reading(temperature=float(temp),
+                                                   humidity=float(humidity),
+                                                   light_level=int(light),
+                                                   motion_detected=motion == b'1',
+                                                   battery_voltage=float(battery),
+                                                   status='connected')
+            elif response:
                 # Parse JSON data
                 try:
-                    data = json.loads(response)
-                    self.sentinel_data = {
-                        'temperature': data.get('temp', 0.0),
-                        'humidity': data.get('humidity', 0.0),
-                        'light_level': data.get('light', 0),
-                        'motion_detected': data.get('motion', False),
-                        'battery_voltage': data.get('battery', 0.0),
-                        'status': 'connected',
-                        'timestamp': time.time()
-                    }
-                except json.JSONDecodeError:
-                    self.logger.debug(f"Invalid JSON from sentinel: {response}")
+                    data = _json_loads(response)
+                    self.sentinel_data = self._reading(temperature=data.get('temp', 0.0),
+                                                       humidity=data.get('humidity', 0.0),
+                                                       light_level=data.get('light', 0),
+                                                       motion_detected=data.get('motion', False),
+                                                       battery_voltage=data.get('battery', 0.0),
+                                                       status='connected')
+                except ValueError:  # JSONDecodeError from either parser
+                    self.logger.debug("Invalid JSON from sentinel: %r", response)
                 
         except Exception as e:
-            self.logger.debug(f"Sentinel communication error: {e}")
-            self.sentinel_data = {
-                'status': 'error',
-                'error': str(e),
-                'timestamp': time.time()
-            }
+            self.logger.debug("Sentinel communication error: %s", e)
+            self.sentinel_data = self._reading(status='error', error=str(e))
     
-    def get_distance_data(self) -> Dict[str, Any]:
-        """Get latest distance scanner data"""
+    def get_distance_data(self) -> Mapping[str, Any]:
+        """Get latest distance scanner data (read-only snapshot)"""
         self._update_distance_scanner()
-        return self.distance_data.copy()
+        return self.distance_data
     
-    def get_sentinel_data(self) -> Dict[str, Any]:
-        """Get latest sentinel data"""
+    def get_sentinel_data(self) -> Mapping[str, Any]:
+        """Get latest sentinel data (read-only snapshot)"""
         self._update_sentinel()
-        return self.sentinel_data.copy()
+        return self.sentinel_data
     
     def get_front_distance(self) -> float:
         """Get front distance reading"""
@@ -215,12 +304,17 @@ class ExternalModuleManager:
     def get_environmental_data(self) -> Dict[str, Any]:
         """Get environmental sensor data from sentinel"""
         self._update_sentinel()
+        sentinel_data = self.sentinel_data
         return {
-            'temperature': self.sentinel_data.get('temperature', 0.0),
-            'humidity': self.sentinel_data.get('humidity', 0.0),
-            'light_level': self.sentinel_data.get('light_level', 0)
+            'temperature': sentinel_data.get('temperature', 0.0),
+            'humidity': sentinel_data.get('humidity', 0.0),
+            'light_level': sentinel_data.get('light_level', 0)
         }
     
+    def set_refresh_rate(self, rate_hz: float):
+        """Set how often each module is polled at most (Hz)"""
+        self.refresh_interval = 1.0 / rate_hz
+    
     def set_low_power_mode(self, enabled: bool):
         """Enable/disable low power mode"""
         self.low_power_mode = enabled
@@ -237,17 +331,9 @@ class ExternalModuleManager:
         """Send command to all connected modules"""
         command_bytes = f"{command}\n".encode()
         
-        if self.distance_scanner_port:
-            try:
-                self.distance_scanner_port.write(command_bytes)
-            except Exception as e:
-                self.logger.debug(f"Error sending command to distance scanner: {e}")
-        
-        if self.sentinel_port:
-            try:
-                self.sentinel_port.write(command_bytes)
-            except Exception as e:
-                self.logger.debug(f"Error sending command to sentinel: {e}")
+        # The poll threads own the ports; each sends the command before its next poll
+        for module in self.poll_threads:
+            self._pending_commands[module] = command_bytes
     
     def get_status(self) -> Dict[str, Any]:
         """Get external module system status"""
@@ -264,6 +350,11 @@ class ExternalModuleManager:
         """Shutdown external module connections"""
         self.logger.info("Shutting down external modules...")
         
+        self.is_polling = False
+        for thread in self.poll_threads.values():
+            if thread.is_alive():
+                thread.join(timeout=2.0)
+        
         if self.distance_scanner_port:
             try:
                 self.distance_scanner_port.close()
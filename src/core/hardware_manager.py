@@ -6,21 +6,21 @@ with external modules like the Arduino distance scanner and NodeMCU sentinel.
 """
 
 import logging
-import serial
-import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any
 
 from .motors import MotorController
 from .sensors import SensorManager
 from .external_modules import ExternalModuleManager
 
+logger = logging.getLogger(__name__)
+
 
 class HardwareManager:
     """Manages all hardware components"""
     
     def __init__(self, config: Dict[str, Any]):
         """Initialize hardware manager"""
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.config = config
         
         # Initialize hardware components
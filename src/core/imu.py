@@ -2,29 +2,83 @@
 IMU sensor class for Ruohobot (GY-521/MPU-6050)
 Reads acceleration and gyro data via I2C.
 """
-import time
+import struct
+from types import MappingProxyType
 try:
     from mpu6050 import mpu6050
 except ImportError:
     mpu6050 = None
 
+# ACCEL_XOUT_H (0x3B) .. GYRO_ZOUT_L (0x48) are contiguous, so accel,
+# temperature and gyro come back in a single 14-byte block read
+ACCEL_XOUT_H = 0x3B
+TEMP_OUT_H = 0x41
+GYRO_XOUT_H = 0x43
+BURST = struct.Struct('>hhhhhhh')
+AXES = struct.Struct('>hhh')    # One big-endian signed x/y/z triple
+TEMP = struct.Struct('>h')
+
+GRAVITY_MS2 = 9.80665
+ACCEL_LSB_PER_G = {2: 16384.0, 4: 8192.0, 8: 4096.0, 16: 2048.0}      # By full-scale range (g)
+GYRO_LSB_PER_DPS = {250: 131.0, 500: 65.5, 1000: 32.8, 2000: 16.4}    # By full-scale range (deg/s)
+
 class IMU:
-    def __init__(self, i2c_address=0x68):
-        if mpu6050 is None:
-            raise ImportError("mpu6050 library is required for IMU support.")
-        self.sensor = mpu6050(i2c_address)
+    def __init__(self, i2c_address=0x68, sensor=None):
+        # An already-initialized mpu6050 can be passed in to skip a second init
+        if sensor is None:
+            if mpu6050 is None:
+                raise ImportError("mpu6050 library is required for IMU support.")
+            sensor = mpu6050(i2c_address)
+        self.sensor = sensor
+
+        # The mpu6050 library re-reads the full-scale range on every sample;
+        # read it once here for the block-read path
+        self._accel_scale = GRAVITY_MS2 / ACCEL_LSB_PER_G.get(self._read_range('read_accel_range', 2), 16384.0)
+        self._gyro_scale = 1.0 / GYRO_LSB_PER_DPS.get(self._read_range('read_gyro_range', 250), 131.0)
+
+        # get_all() overwrites this dict in place and hands out a read-only view
+        self._all = dict.fromkeys(('x', 'y', 'z', 'gyro_x', 'gyro_y', 'gyro_z'), 0.0)
+        self._all_view = MappingProxyType(self._all)
+
+    def _read_range(self, method, default):
+        read = getattr(self.sensor, method, None)
+        return read(raw=False) if read is not None else default
+
+    def _read(self, register, layout):
+        # Registers are unpacked with struct rather than the library's per-byte shifts
+        raw = self.sensor.bus.read_i2c_block_data(self.sensor.address, register, layout.size)
+        return layout.unpack(bytes(raw))
 
     def get_accel(self):
-        return self.sensor.get_accel_data()
+        """Acceleration in m/s^2"""
+        x, y, z = self._read(ACCEL_XOUT_H, AXES)
+        scale = self._accel_scale
+        return {'x': x * scale, 'y': y * scale, 'z': z * scale}
 
     def get_gyro(self):
-        return self.sensor.get_gyro_data()
+        """Angular rate in deg/s"""
+        x, y, z = self._read(GYRO_XOUT_H, AXES)
+        scale = self._gyro_scale
+        return {'x': x * scale, 'y': y * scale, 'z': z * scale}
 
     def get_all(self):
-        data = {}
-        data.update(self.get_accel())
-        data.update(self.get_gyro())
-        return data
+        """
+        Accel (m/s^2: x, y, z) and gyro (deg/s: gyro_x, gyro_y, gyro_z) from one I2C read
+        
+        Returns a read-only view that the next call updates; copy() it to keep a sample.
+        """
+        ax, ay, az, _temp, gx, gy, gz = self._read(ACCEL_XOUT_H, BURST)
+        accel_scale = self._accel_scale
+        gyro_scale = self._gyro_scale
+        result = self._all
+        result['x'] = ax * accel_scale
+        result['y'] = ay * accel_scale
+        result['z'] = az * accel_scale
+        result['gyro_x'] = gx * gyro_scale
+        result['gyro_y'] = gy * gyro_scale
+        result['gyro_z'] = gz * gyro_scale
+        return self._all_view
 
     def get_temperature(self):
-        return self.sensor.get_temp()
+        """Die temperature in degrees C"""
+        return self._read(TEMP_OUT_H, TEMP)[0] / 340.0 + 36.53
@@ -5,19 +5,90 @@ Handles LiDAR data acquisition, processing, and SLAM integration.
 """
 
 import logging
+import select
 import time
 import threading
 import numpy as np
 from typing import Dict, Any, List, Tuple, Optional, Callable
-from dataclasses import dataclass
-from collections import deque
+from dataclasses import dataclass, replace
+from functools import cached_property
 
 
 import serial
 import struct
 import sys
+
+logger = logging.getLogger(__name__)
+
 LIDAR_AVAILABLE = False  # No pyldlidar; we use serial directly
 
+# LD19 packet: 0x54 0x2C header, speed, start angle, 12 x (distance, intensity),
+# end angle, timestamp, CRC8 over the first 46 bytes
+LD19_PACKET_SIZE = 47
+LD19_HEADER = b'\x54\x2c'
+LD19_POINTS_PER_PACKET = 12
+
+# Recent scans kept by LidarManager; a power of two so a slot is seq & mask
+SCAN_HISTORY_SIZE = 128
+SCAN_HISTORY_MASK = SCAN_HISTORY_SIZE - 1
+
+# Field layout of one packet, so a whole scan's packets parse as one array
+_LD19_PACKET = np.dtype([
+    ('header', '<u2'),
+    ('speed', '<u2'),                 # Degrees per second
+    ('start_angle', '<u2'),           # 0.01 degrees
+    ('points', [('distance', '<u2'),  # mm
+                ('intensity', 'u1')], (LD19_POINTS_PER_PACKET,)),
+    ('end_angle', '<u2'),             # 0.01 degrees
+    ('timestamp', '<u2'),             # ms
+    ('crc', 'u1'),
+])
+
+# Official LD19 CRC8 table from the SDK
+_CRC8_TABLE = np.array([
+    0x00, 0x4d, 0x9a, 0xd7, 0x79, 0x34, 0xe3, 0xae, 0xf2, 0xbf, 0x68, 0x25,
+    0x8b, 0xc6, 0x11, 0x5c, 0xa9, 0xe4, 0x33, 0x7e, 0xd0, 0x9d, 0x4a, 0x07,
+    0x5b, 0x16, 0xc1, 0x8c, 0x22, 0x6f, 0xb8, 0xf5, 0x1f, 0x52, 0x85, 0xc8,
+    0x66, 0x2b, 0xfc, 0xb1, 0xed, 0xa0, 0x77, 0x3a, 0x94, 0xd9, 0x0e, 0x43,
+    0xb6, 0xfb, 0x2c, 0x61, 0xcf, 0x82, 0x55, 0x18, 0x44, 0x09, 0xde, 0x93,
+    0x3d, 0x70, 0xa7, 0xea, 0x3e, 0x73, 0xa4, 0xe9, 0x47, 0x0a, 0xdd, 0x90,
+    0xcc, 0x81, 0x56, 0x1b, 0xb5, 0xf8, 0x2f, 0x62, 0x97, 0xda, 0x0d, 0x40,
+    0xee, 0xa3, 0x74, 0x39, 0x65, 0x28, 0xff, 0xb2, 0x1c, 0x51, 0x86, 0xcb,
+    0x21, 0x6c, 0xbb, 0xf6, 0x58, 0x15, 0xc2, 0x8f, 0xd3, 0x9e, 0x49, 0x04,
+    0xaa, 0xe7, 0x30, 0x7d, 0x88, 0xc5, 0x12, 0x5f, 0xf1, 0xbc, 0x6b, 0x26,
+    0x7a, 0x37, 0xe0, 0xad, 0x03, 0x4e, 0x99, 0xd4, 0x7c, 0x31, 0xe6, 0xab,
+    0x05, 0x48, 0x9f, 0xd2, 0x8e, 0xc3, 0x14, 0x59, 0xf7, 0xba, 0x6d, 0x20,
+    0xd5, 0x98, 0x4f, 0x02, 0xac, 0xe1, 0x36, 0x7b, 0x27, 0x6a, 0xbd, 0xf0,
+    0x5e, 0x13, 0xc4, 0x89, 0x63, 0x2e, 0xf9, 0xb4, 0x1a, 0x57, 0x80, 0xcd,
+    0x91, 0xdc, 0x0b, 0x46, 0xe8, 0xa5, 0x72, 0x3f, 0xca, 0x87, 0x50, 0x1d,
+    0xb3, 0xfe, 0x29, 0x64, 0x38, 0x75, 0xa2, 0xef, 0x41, 0x0c, 0xdb, 0x96,
+    0x42, 0x0f, 0xd8, 0x95, 0x3b, 0x76, 0xa1, 0xec, 0xb0, 0xfd, 0x2a, 0x67,
+    0xc9, 0x84, 0x53, 0x1e, 0xeb, 0xa6, 0x71, 0x3c, 0x92, 0xdf, 0x08, 0x45,
+    0x19, 0x54, 0x83, 0xce, 0x60, 0x2d, 0xfa, 0xb7, 0x5d, 0x10, 0xc7, 0x8a,
+    0x24, 0x69, 0xbe, 0xf3, 0xaf, 0xe2, 0x35, 0x78, 0xd6, 0x9b, 0x4c, 0x01,
+    0xf4, 0xb9, 0x6e, 0x23, 0x8d, 0xc0, 0x17, 0x5a, 0x06, 0x4b, 0x9c, 0xd1,
+    0x7f, 0x32, 0xe5, 0xa8
+], dtype=np.uint8)
+
+
+def _crc8_batch(packets: np.ndarray) -> np.ndarray:
+    """
+    Check the CRC8 of many LD19 packets at once
+    
+    The CRC runs sequentially through a packet but packets are independent, so
+    each byte column is a single table lookup across all packets.
+    
+    Args:
+        packets: (N, 47) uint8 array of raw packets
+        
+    Returns:
+        (N,) bool array, True where the packet's CRC byte matches
+    """
+    crc = np.zeros(len(packets), dtype=np.uint8)
+    for column in range(LD19_PACKET_SIZE - 1):
+        crc = _CRC8_TABLE[crc ^ packets[:, column]]
+    return crc == packets[:, LD19_PACKET_SIZE - 1]
+
 
 @dataclass
 class LidarPoint:
@@ -30,11 +101,29 @@ class LidarPoint:
 
 @dataclass
 class LidarScan:
-    """Complete LiDAR scan (360 degrees)"""
+    """
+    Complete LiDAR scan (360 degrees), stored as parallel arrays
+    
+    Scans read from the LD19 hold at most one point per whole degree (the
+    first one received that rounds to it), sorted by angle.
+    """
     timestamp: float
-    points: List[LidarPoint]
+    angles: np.ndarray        # Degrees (0-360), float32
+    distances: np.ndarray     # Meters, float32
+    intensities: np.ndarray   # Signal intensity, uint8
+    valid: np.ndarray         # Whether each measurement is valid, bool
     scan_frequency: float
-    total_points: int
+    
+    @property
+    def total_points(self) -> int:
+        return len(self.angles)
+    
+    @cached_property
+    def points(self) -> List[LidarPoint]:
+        """Per-point objects for callers that iterate points; built on first access"""
+        return [LidarPoint(angle=angle, distance=distance, intensity=intensity, valid=valid)
+                for angle, distance, intensity, valid in zip(self.angles.tolist(), self.distances.tolist(),
+                                                             self.intensities.tolist(), self.valid.tolist())]
     
     def parse_ld19_data(self, raw_data: bytes):
         """Parse LD-19 LiDAR data"""
@@ -55,7 +144,7 @@ class LidarManager:
     """LD-19 LiDAR data acquisition and processing (real and simulated)"""
 
     def __init__(self, config: Dict[str, Any], simulate: bool = False):
-        self.logger = logging.getLogger("core.lidar")
+        self.logger = logger
         self.config = config
 
 
@@ -84,12 +173,17 @@ class LidarManager:
 
         # Data storage
         self.current_scan: Optional[LidarScan] = None
-        self.scan_history = deque(maxlen=100)
+        # Single-producer ring of recent scans: only the scan thread writes a
+        # slot and then advances the head, so readers never take a lock
+        self._scan_ring: List[Optional[LidarScan]] = [None] * SCAN_HISTORY_SIZE
+        self._scan_head = 0   # Number of scans published so far
         self.is_scanning = False
         self.scan_thread: Optional[threading.Thread] = None
 
-        # Callbacks
+        # Callbacks run on their own thread so a slow consumer never delays serial reads
         self.scan_callback: Optional[Callable[[LidarScan], None]] = None
+        self.callback_thread: Optional[threading.Thread] = None
+        self._scan_ready = threading.Event()
 
         # Statistics
         self.total_scans = 0
@@ -98,15 +192,35 @@ class LidarManager:
 
         # Serial port for real LD19
         self.serial = None
+        self._rx_buf = bytearray()   # Received bytes not yet parsed (partial packet, next scan)
+        self._fd: Optional[int] = None   # Serial file descriptor for select(), when the port has one
         self.simulate = simulate or not self.enabled
         if not self.simulate:
             try:
                 self.serial = serial.Serial(self.port, self.baudrate, timeout=1)
                 self.logger.info(f"LD-19 serial port opened: {self.port} @ {self.baudrate}")
+                try:
+                    self._fd = self.serial.fileno()
+                except (AttributeError, OSError, ValueError):
+                    self._fd = None
             except Exception as e:
                 self.logger.warning(f"Failed to open LD-19 serial port: {e}. Falling back to simulation.")
                 self.simulate = True
+        self._sim_scan: Optional[LidarScan] = None
         if self.simulate:
+            # The simulated room never changes, so build its scan once and
+            # only restamp it each tick
+            num_points = 360
+            scan_data = np.full((num_points,), 4000, dtype=np.float32)  # 4m default
+            scan_data[170:191] = 1000  # 1m
+            scan_data[90] = 2000  # 2m
+            scan_data[270] = 1500  # 1.5m
+            self.logger.debug(f"[SIM] Generated scan_data (first 10): {scan_data[:10]}")
+            self._sim_scan = self._process_simulated_scan(scan_data)
+            # Every simulated scan shares these arrays
+            for array in (self._sim_scan.angles, self._sim_scan.distances,
+                          self._sim_scan.intensities, self._sim_scan.valid):
+                array.flags.writeable = False
             self.logger.info("LidarManager initialized (simulated mode)")
     
     # _initialize_lidar removed (no longer needed)
@@ -119,14 +233,18 @@ class LidarManager:
         self.is_scanning = True
         self.scan_thread = threading.Thread(target=self._scan_loop, daemon=True)
         self.scan_thread.start()
+        self.callback_thread = threading.Thread(target=self._callback_loop, daemon=True)
+        self.callback_thread.start()
         return True
     
     def stop_scanning(self):
         """Stop LiDAR scanning"""
         self.logger.info("LidarManager: stop_scanning called")
         self.is_scanning = False
-        if self.scan_thread and self.scan_thread.is_alive():
-            self.scan_thread.join(timeout=2.0)
+        self._scan_ready.set()  # Wake the callback thread so it can exit
+        for thread in (self.scan_thread, self.callback_thread):
+            if thread and thread.is_alive():
+                thread.join(timeout=2.0)
         if self.serial:
             try:
                 self.serial.close()
@@ -137,62 +255,73 @@ class LidarManager:
     def _scan_loop(self):
         """Main scanning loop running in background thread"""
         self.logger.info("LiDAR scan loop started")
+        next_scan = time.monotonic()
         while self.is_scanning:
             try:
                 if self.simulate:
-                    num_points = 360
-                    scan_data = np.full((num_points,), 4000, dtype=np.float32)  # 4m default
-                    for i in range(170, 191):
-                        scan_data[i % num_points] = 1000  # 1m
-                    scan_data[90] = 2000  # 2m
-                    scan_data[270] = 1500  # 1.5m
-                    self.logger.debug(f"[SIM] Generated scan_data (first 10): {scan_data[:10]}")
-                    processed_scan = self._process_simulated_scan(scan_data)
+                    processed_scan = replace(self._sim_scan, timestamp=time.time())
                 else:
                     self.logger.debug("[REAL] Attempting to read LD19 scan from serial...")
                     processed_scan = self._read_ld19_scan()
                 if processed_scan:
                     self.logger.debug(f"Scan processed: timestamp={processed_scan.timestamp}, total_points={processed_scan.total_points}")
-                    if processed_scan.points:
-                        sample_points = processed_scan.points[:5]
-                        self.logger.debug(f"First 5 points: {[{'angle': p.angle, 'dist': p.distance, 'valid': p.valid} for p in sample_points]}")
+                    if processed_scan.total_points:
+                        self.logger.debug(f"First 5 points (angle, dist, valid): {list(zip(processed_scan.angles[:5].tolist(), processed_scan.distances[:5].tolist(), processed_scan.valid[:5].tolist()))}")
                     self.current_scan = processed_scan
-                    self.scan_history.append(processed_scan)
+                    self._scan_ring[self._scan_head & SCAN_HISTORY_MASK] = processed_scan
+                    self._scan_head += 1
                     self.total_scans += 1
                     self.last_scan_time = time.time()
-                    if self.scan_callback:
-                        try:
-                            self.logger.debug("Calling scan_callback with new scan.")
-                            self.scan_callback(processed_scan)
-                        except Exception as e:
-                            self.logger.warning(f"Scan callback error: {e}")
+                    self._scan_ready.set()
                 else:
                     self.logger.warning("No scan processed in this loop iteration.")
-                time.sleep(1.0 / self.scan_frequency)
+                # Sleep to a fixed schedule so read and parse time don't lower the rate
+                period = 1.0 / self.scan_frequency
+                next_scan += period
+                delay = next_scan - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -2 * period:
+                    next_scan = time.monotonic()  # Far behind (e.g. serial timeout); don't burst
             except Exception as e:
                 self.logger.warning(f"Scan loop error: {e}")
                 self.scan_errors += 1
                 time.sleep(0.1)
+                next_scan = time.monotonic()
         self.logger.info("LiDAR scan loop stopped")
+    
+    def _callback_loop(self):
+        """Deliver published scans to scan_callback off the scan thread"""
+        sequence = self._scan_head
+        while self.is_scanning:
+            if not self._scan_ready.wait(timeout=0.5):
+                continue
+            self._scan_ready.clear()
+            scans, sequence = self.get_scans_since(sequence)
+            callback = self.scan_callback
+            if not scans or not callback:
+                continue
+            # A consumer that fell behind gets the newest scan, not the backlog
+            if len(scans) > 1:
+                self.logger.debug(f"Scan callback behind, skipping {len(scans) - 1} scans.")
+            try:
+                self.logger.debug("Calling scan_callback with new scan.")
+                callback(scans[-1])
+            except Exception as e:
+                self.logger.warning(f"Scan callback error: {e}")
 
     def _process_simulated_scan(self, scan_data) -> Optional[LidarScan]:
         """Process simulated scan data into LidarScan"""
-        points = []
-        for angle in range(len(scan_data)):
-            distance = scan_data[angle] / 1000.0
-            valid = 0.05 < distance < 12.0
-            points.append(LidarPoint(
-                angle=angle,
-                distance=distance,
-                intensity=0,
-                valid=valid
-            ))
-        self.logger.debug(f"[SIM] Processed {len(points)} points in simulated scan.")
+        # One reading per whole degree, in mm
+        distances = np.asarray(scan_data, dtype=np.float32) / np.float32(1000.0)
+        self.logger.debug(f"[SIM] Processed {len(distances)} points in simulated scan.")
         return LidarScan(
             timestamp=time.time(),
-            points=points,
-            scan_frequency=self.scan_frequency,
-            total_points=len(points)
+            angles=np.arange(len(distances), dtype=np.float32),
+            distances=distances,
+            intensities=np.zeros(len(distances), dtype=np.uint8),
+            valid=(distances > 0.05) & (distances < 12.0),
+            scan_frequency=self.scan_frequency
         )
 
     def _read_ld19_scan(self) -> Optional[LidarScan]:
@@ -201,118 +330,139 @@ class LidarManager:
             self.logger.warning("Serial port not open for LD19.")
             return None
 
-        def crc8(data: bytes) -> int:
-            # Official CRC8 table from SDK
-            table = [
-                0x00, 0x4d, 0x9a, 0xd7, 0x79, 0x34, 0xe3, 0xae, 0xf2, 0xbf, 0x68, 0x25,
-                0x8b, 0xc6, 0x11, 0x5c, 0xa9, 0xe4, 0x33, 0x7e, 0xd0, 0x9d, 0x4a, 0x07,
-                0x5b, 0x16, 0xc1, 0x8c, 0x22, 0x6f, 0xb8, 0xf5, 0x1f, 0x52, 0x85, 0xc8,
-                0x66, 0x2b, 0xfc, 0xb1, 0xed, 0xa0, 0x77, 0x3a, 0x94, 0xd9, 0x0e, 0x43,
-                0xb6, 0xfb, 0x2c, 0x61, 0xcf, 0x82, 0x55, 0x18, 0x44, 0x09, 0xde, 0x93,
-                0x3d, 0x70, 0xa7, 0xea, 0x3e, 0x73, 0xa4, 0xe9, 0x47, 0x0a, 0xdd, 0x90,
-                0xcc, 0x81, 0x56, 0x1b, 0xb5, 0xf8, 0x2f, 0x62, 0x97, 0xda, 0x0d, 0x40,
-                0xee, 0xa3, 0x74, 0x39, 0x65, 0x28, 0xff, 0xb2, 0x1c, 0x51, 0x86, 0xcb,
-                0x21, 0x6c, 0xbb, 0xf6, 0x58, 0x15, 0xc2, 0x8f, 0xd3, 0x9e, 0x49, 0x04,
-                0xaa, 0xe7, 0x30, 0x7d, 0x88, 0xc5, 0x12, 0x5f, 0xf1, 0xbc, 0x6b, 0x26,
-                0x7a, 0x37, 0xe0, 0xad, 0x03, 0x4e, 0x99, 0xd4, 0x7c, 0x31, 0xe6, 0xab,
-                0x05, 0x48, 0x9f, 0xd2, 0x8e, 0xc3, 0x14, 0x59, 0xf7, 0xba, 0x6d, 0x20,
-                0xd5, 0x98, 0x4f, 0x02, 0xac, 0xe1, 0x36, 0x7b, 0x27, 0x6a, 0xbd, 0xf0,
-                0x5e, 0x13, 0xc4, 0x89, 0x63, 0x2e, 0xf9, 0xb4, 0x1a, 0x57, 0x80, 0xcd,
-                0x91, 0xdc, 0x0b, 0x46, 0xe8, 0xa5, 0x72, 0x3f, 0xca, 0x87, 0x50, 0x1d,
-                0xb3, 0xfe, 0x29, 0x64, 0x38, 0x75, 0xa2, 0xef, 0x41, 0x0c, 0xdb, 0x96,
-                0x42, 0x0f, 0xd8, 0x95, 0x3b, 0x76, 0xa1, 0xec, 0xb0, 0xfd, 0x2a, 0x67,
-                0xc9, 0x84, 0x53, 0x1e, 0xeb, 0xa6, 0x71, 0x3c, 0x92, 0xdf, 0x08, 0x45,
-                0x19, 0x54, 0x83, 0xce, 0x60, 0x2d, 0xfa, 0xb7, 0x5d, 0x10, 0xc7, 0x8a,
-                0x24, 0x69, 0xbe, 0xf3, 0xaf, 0xe2, 0x35, 0x78, 0xd6, 0x9b, 0x4c, 0x01,
-                0xf4, 0xb9, 0x6e, 0x23, 0x8d, 0xc0, 0x17, 0x5a, 0x06, 0x4b, 0x9c, 0xd1,
-                0x7f, 0x32, 0xe5, 0xa8
-            ]
-            crc = 0
-            for b in data:
-                crc = table[(crc ^ b) & 0xFF]
-            return crc
-
-        scan_points: List[LidarPoint] = []
+        packets: List[bytes] = []
         last_end_angle = None
         scan_complete = False
         start_time = time.time()
         timeout = 1.0  # seconds
         raw_packet_log_count = 0
-        packets_collected = 0
+        buf = self._rx_buf
         while not scan_complete and (time.time() - start_time) < timeout:
             try:
-                # Find packet header
-                header = self.serial.read(2)
-                if len(header) < 2:
-                    continue
-                if header[0] != 0x54 or header[1] != 0x2C:
-                    continue
-                packet = header + self.serial.read(45)
-                if len(packet) != 47:
-                    continue
-                if raw_packet_log_count < 3:
-                    self.logger.debug(f"[RAW PACKET {raw_packet_log_count+1}] {packet.hex(' ')}")
-                # CRC8 check
-                if crc8(packet[:46]) != packet[46]:
-                    self.logger.debug("[CRC] CRC8 mismatch, skipping packet.")
-                    continue
-                # Parse packet fields
-                speed = int.from_bytes(packet[2:4], 'little')
-                start_angle = int.from_bytes(packet[4:6], 'little') / 100.0  # degrees
-                points = []
-                for i in range(12):
-                    offset = 6 + i * 3
-                    distance = int.from_bytes(packet[offset:offset+2], 'little') / 1000.0  # meters
-                    intensity = packet[offset+2]
-                    points.append((distance, intensity))
-                end_angle = int.from_bytes(packet[42:44], 'little') / 100.0  # degrees
-                timestamp = int.from_bytes(packet[44:46], 'little')
-                # Interpolate angles for 12 points
-                angle_diff = (end_angle - start_angle)
-                if angle_diff < 0:
-                    angle_diff += 360.0
-                angle_step = angle_diff / (12 - 1)
-                angles = [(start_angle + i * angle_step) % 360.0 for i in range(12)]
-                # If this is the first packet, just start collecting
-                if last_end_angle is not None:
-                    # Detect wraparound (end of scan)
-                    if (start_angle < last_end_angle) and (last_end_angle - start_angle > 180):
-                        scan_complete = True
-                last_end_angle = end_angle
-                # Add points to scan
-                for (distance, intensity), angle in zip(points, angles):
-                    valid = 0.05 < distance < 12.0
-                    scan_points.append(LidarPoint(
-                        angle=angle,
-                        distance=distance,
-                        intensity=intensity,
-                        valid=valid
-                    ))
-                packets_collected += 1
-                if raw_packet_log_count < 3:
-                    self.logger.debug(f"[PARSE] Packet {packets_collected}: start_angle={start_angle:.2f}, end_angle={end_angle:.2f}, first 3 points: {scan_points[-12:-9]}")
-                    raw_packet_log_count += 1
+                waiting = self.serial.in_waiting
+                if not waiting and self._fd is not None:
+                    # Wait for data in select() rather than in a blocking read
+                    remaining = timeout - (time.time() - start_time)
+                    if not select.select([self._fd], [], [], max(0.0, remaining))[0]:
+                        continue
+                    waiting = self.serial.in_waiting
+                # One read takes everything the UART has buffered (at least a packet)
+                buf += self.serial.read(max(LD19_PACKET_SIZE, waiting))
+                pos = 0
+                while not scan_complete:
+                    # Slice out every complete packet from pos on
+                    starts: List[int] = []
+                    end = pos
+                    while True:
+                        # Find packet header
+                        start = buf.find(LD19_HEADER, end)
+                        if start < 0:
+                            # Keep a trailing 0x54 that may begin the next header
+                            end = max(end, len(buf) - 1)
+                            break
+                        if len(buf) - start < LD19_PACKET_SIZE:
+                            end = start
+                            break
+                        starts.append(start)
+                        end = start + LD19_PACKET_SIZE
+                    if not starts:
+                        pos = end
+                        break
+                    chunk = b''.join([buf[start:start + LD19_PACKET_SIZE] for start in starts])
+                    while raw_packet_log_count < min(3, len(starts)):
+                        packet = chunk[raw_packet_log_count * LD19_PACKET_SIZE:(raw_packet_log_count + 1) * LD19_PACKET_SIZE]
+                        self.logger.debug(f"[RAW PACKET {raw_packet_log_count+1}] {packet.hex(' ')}")
+                        raw_packet_log_count += 1
+                    # CRC8 check for the whole chunk in one pass, before any
+                    # packet's angles can end the scan
+                    crc_ok = _crc8_batch(np.frombuffer(chunk, dtype=np.uint8).reshape(-1, LD19_PACKET_SIZE))
+                    fields = np.frombuffer(chunk, dtype=_LD19_PACKET)
+                    chunk_angles = zip(crc_ok.tolist(), fields['start_angle'].tolist(), fields['end_angle'].tolist())
+                    resync = False
+                    for i, (ok, start_angle, end_angle) in enumerate(chunk_angles):
+                        if not ok:
+                            # The header may have been a 0x54 0x2C in noise or a payload,
+                            # and a real packet can start inside its 47 bytes: search
+                            # again from the next byte and reframe the rest
+                            self.logger.debug("[CRC] CRC8 mismatch, resyncing.")
+                            pos = starts[i] + 1
+                            resync = True
+                            break
+                        # A packet with impossible angles is corrupt and must not end the scan
+                        if start_angle >= 36000 or end_angle >= 36000:
+                            continue
+                        start_angle /= 100.0  # degrees
+                        end_angle /= 100.0    # degrees
+                        # If this is the first packet, just start collecting
+                        if last_end_angle is not None:
+                            # Detect wraparound (end of scan)
+                            if (start_angle < last_end_angle) and (last_end_angle - start_angle > 180):
+                                scan_complete = True
+                        last_end_angle = end_angle
+                        packets.append(chunk[i * LD19_PACKET_SIZE:(i + 1) * LD19_PACKET_SIZE])
+                        if scan_complete:
+                            # Later packets belong to the next scan
+                            pos = starts[i] + LD19_PACKET_SIZE
+                            break
+                    if not resync and not scan_complete:
+                        pos = end
+                        break
+                # Bytes after the last packet used stay buffered for the next read
+                del buf[:pos]
             except Exception as e:
                 self.logger.warning(f"LD19 serial read error: {e}")
                 break
-        # Optionally, sort points by angle and deduplicate
-        scan_points = sorted(scan_points, key=lambda p: p.angle)
-        # Remove duplicate angles (keep first occurrence)
-        seen_angles = set()
-        unique_points = []
-        for p in scan_points:
-            a = int(round(p.angle))
-            if a not in seen_angles:
-                unique_points.append(p)
-                seen_angles.add(a)
-        valid_points = sum(1 for p in unique_points if p.valid)
-        self.logger.info(f"[SCAN SUMMARY] packets={packets_collected}, valid_points={valid_points}, total_points={len(unique_points)}")
-        self.logger.debug(f"[REAL] Finished scan: {len(unique_points)} points collected. First 5: {[{'angle': p.angle, 'dist': p.distance, 'valid': p.valid} for p in unique_points[:5]]}")
+        
+        # If more than two scans are already queued (the USB-serial adapter buffers
+        # a lot), drop them so the next scan is fresh instead of ever more delayed
+        if packets:
+            try:
+                backlog = self.serial.in_waiting + len(buf)
+                if backlog > 2 * len(packets) * LD19_PACKET_SIZE:
+                    self.logger.warning(f"LD19 input backlog of {backlog} bytes, flushing.")
+                    self.serial.reset_input_buffer()
+                    buf.clear()
+            except Exception as e:
+                self.logger.warning(f"LD19 input flush error: {e}")
+        
+        # Parse packet fields for all packets of the scan at once
+        fields = np.frombuffer(b''.join(packets), dtype=_LD19_PACKET)
+        start_angles = fields['start_angle'] / 100.0              # degrees
+        end_angles = fields['end_angle'] / 100.0                  # degrees
+        distances = fields['points']['distance'] / 1000.0         # meters, (N, 12)
+        intensities = fields['points']['intensity']               # (N, 12)
+        packets_collected = len(fields)
+        
+        # Interpolate the 12 point angles of every packet, wrapping through 0 degrees
+        angle_steps = np.mod(end_angles - start_angles, 360.0) / (LD19_POINTS_PER_PACKET - 1)
+        angles = np.mod(start_angles[:, None] + np.arange(LD19_POINTS_PER_PACKET) * angle_steps[:, None], 360.0).ravel()
+        distances = distances.ravel()
+        intensities = intensities.ravel()
+        if packets_collected:
+            self.logger.debug(f"[PARSE] First packet: start_angle={start_angles[0]:.2f}, end_angle={end_angles[0]:.2f}, "
+                              f"first 3 points: {list(zip(angles[:3].tolist(), distances[:3].tolist()))}")
+        # Keep one point per whole degree, indexed by bucket so no sort or set
+        # is needed; assigning in reverse leaves the first arrival in each slot
+        buckets = np.mod(np.round(angles).astype(np.int32), 360)
+        first_in_bucket = np.full(360, -1, dtype=np.intp)
+        first_in_bucket[buckets[::-1]] = np.arange(len(buckets) - 1, -1, -1)
+        keep = first_in_bucket[first_in_bucket >= 0]
+        # Slot 0 also takes angles from 359.5 up; move such a point to the end
+        # so the scan stays sorted by angle
+        if len(keep) > 1 and angles[keep[0]] > 180.0:
+            keep = np.roll(keep, -1)
+        angles, distances, intensities = angles[keep], distances[keep], intensities[keep]
+        valid = (distances > 0.05) & (distances < 12.0)
+        self.logger.info(f"[SCAN SUMMARY] packets={packets_collected}, valid_points={int(valid.sum())}, total_points={len(angles)}")
+        self.logger.debug(f"[REAL] Finished scan: {len(angles)} points collected. First 5: "
+                          f"{list(zip(angles[:5].tolist(), distances[:5].tolist(), valid[:5].tolist()))}")
         return LidarScan(
             timestamp=time.time(),
-            points=unique_points,
-            scan_frequency=self.scan_frequency,
-            total_points=len(unique_points)
+            angles=angles.astype(np.float32),
+            distances=distances.astype(np.float32),
+            intensities=intensities,
+            valid=valid,
+            scan_frequency=self.scan_frequency
         )
     
     # _process_scan_data removed (replaced by _process_simulated_scan and _read_ld19_scan)
@@ -328,41 +478,53 @@ class LidarManager:
         if not scan:
             self.logger.debug("get_scan_as_cartesian: No scan available.")
             return np.array([]).reshape(0, 2)
-        points = []
-        for point in scan.points:
-            if point.valid:
-                x = point.distance * np.cos(np.radians(point.angle))
-                y = point.distance * np.sin(np.radians(point.angle))
-                points.append([x, y])
-        self.logger.debug(f"get_scan_as_cartesian: {len(points)} valid points. Sample: {points[:5]}")
-        return np.array(points)
+        valid = scan.valid
+        distances = scan.distances[valid]
+        angles = np.radians(scan.angles[valid])
+        points = np.column_stack((distances * np.cos(angles), distances * np.sin(angles)))
+        self.logger.debug("get_scan_as_cartesian: %d valid points. Sample: %s", len(points), points[:5])
+        return points
     
     def get_obstacles_in_direction(self, direction: float, cone_angle: float = 30.0) -> List[float]:
         """Get obstacle distances in a specific direction cone"""
-        if not self.current_scan:
+        scan = self.current_scan
+        if not scan:
             return []
         
-        obstacles = []
-        half_cone = cone_angle / 2.0
-        
-        for point in self.current_scan.points:
-            if not point.valid:
-                continue
-            
-            # Normalize angle difference
-            angle_diff = abs(point.angle - direction)
-            if angle_diff > 180:
-                angle_diff = 360 - angle_diff
-            
-            if angle_diff <= half_cone:
-                obstacles.append(point.distance)
-        
-        return sorted(obstacles)  # Closest first
+        # Normalize angle differences, then keep valid points inside the cone
+        angle_diff = np.abs(scan.angles - direction)
+        angle_diff = np.minimum(angle_diff, 360.0 - angle_diff)
+        in_cone = scan.valid & (angle_diff <= cone_angle / 2.0)
+        return np.sort(scan.distances[in_cone]).tolist()  # Closest first
     
     def set_scan_callback(self, callback: Callable[[LidarScan], None]):
         """Set callback function for new scans"""
         self.scan_callback = callback
     
+    @property
+    def scan_history(self) -> List[LidarScan]:
+        """Retained scans, oldest first"""
+        return self.get_scans_since(0)[0]
+    
+    def get_scans_since(self, sequence: int) -> Tuple[List[LidarScan], int]:
+        """
+        Get scans published after a sequence number
+        
+        Args:
+            sequence: Value returned by the previous call, or 0 for all retained scans
+        
+        Returns:
+            The scans still in the ring (oldest first) and the sequence number for the next call
+        """
+        head = self._scan_head
+        first = max(sequence, head - SCAN_HISTORY_SIZE)
+        scans = [self._scan_ring[i & SCAN_HISTORY_MASK] for i in range(first, head)]
+        # Drop slots the scan thread overwrote while they were being copied
+        overwritten = self._scan_head - SCAN_HISTORY_SIZE - first
+        if overwritten > 0:
+            scans = scans[overwritten:]
+        return scans, head
+    
     def get_status(self) -> Dict[str, Any]:
         """Get LiDAR status information"""
         return {
@@ -372,7 +534,7 @@ class LidarManager:
             'scan_errors': self.scan_errors,
             'last_scan_age': time.time() - self.last_scan_time if self.last_scan_time > 0 else -1,
             'scan_frequency': self.scan_frequency,
-            'current_points': len(self.current_scan.points) if self.current_scan else 0,
+            'current_points': self.current_scan.total_points if self.current_scan else 0,
             'simulated': self.simulate
         }
     
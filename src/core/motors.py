@@ -7,19 +7,46 @@ This module handles the low-level communication with the Motoron controller via
 
 import logging
 import time
-from typing import Dict, Any, Tuple
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, Tuple, Optional
 try:
     import motoron
 except ImportError:
     motoron = None
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class MotorConfig:
+    """Settings for one Motoron channel, parsed once from the pololu_m3h550 section"""
+    max_acceleration: int
+    max_deceleration: int
+    reversed: bool
+    enabled: bool
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], motor_id: int) -> 'MotorConfig':
+        """
+        Parse the motor_<id>_* keys for one motor
+        
+        Raises:
+            ValueError: If an acceleration or deceleration is not a number
+        """
+        return cls(
+            max_acceleration=int(config.get(f'motor_{motor_id}_acceleration', 140)),
+            max_deceleration=int(config.get(f'motor_{motor_id}_deceleration', 300)),
+            reversed=bool(config.get(f'motor_{motor_id}_reversed', False)),
+            enabled=bool(config.get(f'motor_{motor_id}_enabled', True))
+        )
+
 
 class MotorController:
     """Motor controller interface for the Pololu Motoron M3H550"""
     
     def __init__(self, config: Dict[str, Any]):
         """Initialize the motor controller"""
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.config = config.get('pololu_m3h550', {})
         
         if motoron is None:
@@ -39,35 +66,32 @@ class MotorController:
             'unused_motor': 1
         })
         
+        # Motor configuration, validated once here
+        self.motor_config = {motor_id: MotorConfig.from_config(self.config, motor_id)
+                             for motor_id in (1, 2, 3)}
+        
         # Motor enabled/disabled status
-        self.motor_enabled = {
-            1: self.config.get('motor_1_enabled', True),
-            2: self.config.get('motor_2_enabled', True),
-            3: self.config.get('motor_3_enabled', True)
-        }
+        self.motor_enabled = {motor_id: config.enabled for motor_id, config in self.motor_config.items()}
         
-        # Motor configuration
-        self.motor_config = {
-            1: {
-                'max_acceleration': self.config.get('motor_1_acceleration', 140),
-                'max_deceleration': self.config.get('motor_1_deceleration', 300),
-                'reversed': self.config.get('motor_1_reversed', False)
-            },
-            2: {
-                'max_acceleration': self.config.get('motor_2_acceleration', 140),
-                'max_deceleration': self.config.get('motor_2_deceleration', 300),
-                'reversed': self.config.get('motor_2_reversed', False)
-            },
-            3: {
-                'max_acceleration': self.config.get('motor_3_acceleration', 140),
-                'max_deceleration': self.config.get('motor_3_deceleration', 300),
-                'reversed': self.config.get('motor_3_reversed', False)
-            }
-        }
+        # Per-command values kept as plain scalars for _prepare_speed
+        self._motor_ids = (1, 2, 3)
+        self._speed_signs = tuple(-1 if self.motor_config[motor_id].reversed else 1 for motor_id in self._motor_ids)
+        self._max_speed = int(self.max_speed)
         
         # Current motor speeds
         self.current_speeds = {1: 0, 2: 0, 3: 0}
         
+        # Speeds queued by queue_speed(), sent together by flush()
+        self._pending: Dict[int, int] = {}
+        
+        # Stop command arguments, built once so stop paths do no per-call work.
+        # A single 'Set all speeds' command also writes disabled channels, so
+        # flush() and the stop paths only use it when every motor is enabled.
+        self._stop_speeds = (0, 0, 0)
+        self._stopped_speeds = {1: 0, 2: 0, 3: 0}
+        self._enabled_motor_ids = tuple(motor_id for motor_id, enabled in self.motor_enabled.items() if enabled)
+        self._stop_all_at_once = len(self._enabled_motor_ids) == 3
+        
         try:
             # Initialize Motoron controller
             self.mc = motoron.MotoronI2C(bus=self.i2c_bus, address=self.i2c_address)
@@ -94,8 +118,8 @@ class MotorController:
             
             # Configure each motor
             for motor_id, config in self.motor_config.items():
-                self.mc.set_max_acceleration(motor_id, config['max_acceleration'])
-                self.mc.set_max_deceleration(motor_id, config['max_deceleration'])
+                self.mc.set_max_acceleration(motor_id, config.max_acceleration)
+                self.mc.set_max_deceleration(motor_id, config.max_deceleration)
             
             # Clear any motor faults
             self.mc.clear_motor_fault_unconditional()
@@ -106,33 +130,41 @@ class MotorController:
             self.logger.error(f"Error during controller initialization: {e}")
             raise
     
-    def set_speed(self, motor_id: int, speed: int):
+    def _prepare_speed(self, motor_id: int, speed: int) -> Optional[int]:
         """
-        Set speed for a specific motor
+        Validate, clamp and apply reversal to a speed command
         
-        Args:
-            motor_id: Motor number (1, 2, or 3)
-            speed: Speed from -800 to +800 (negative = reverse)
+        Returns:
+            Speed to send to the Motoron, or None if the command is dropped
         """
-        if motor_id not in [1, 2, 3]:
+        if motor_id not in self._motor_ids:
             self.logger.error(f"Invalid motor ID: {motor_id}. Must be 1, 2, or 3")
-            return
+            return None
         
         # Check if motor is enabled
         if not self.motor_enabled.get(motor_id, True):
             # Only log if debug
-            return
+            return None
         
         if self.emergency_stop_active:
             self.logger.warning("Emergency stop active, ignoring speed command")
-            return
+            return None
         
-        # Clamp speed to valid range
-        speed = max(-self.max_speed, min(self.max_speed, speed))
+        # Clamp speed to valid range and apply motor reversal if configured
+        max_speed = self._max_speed
+        return max(-max_speed, min(max_speed, speed)) * self._speed_signs[motor_id - 1]
+    
+    def set_speed(self, motor_id: int, speed: int):
+        """
+        Set speed for a specific motor
         
-        # Apply motor reversal if configured
-        if self.motor_config[motor_id]['reversed']:
-            speed = -speed
+        Args:
+            motor_id: Motor number (1, 2, or 3)
+            speed: Speed from -800 to +800 (negative = reverse)
+        """
+        speed = self._prepare_speed(motor_id, speed)
+        if speed is None:
+            return
         
         try:
             self.mc.set_speed(motor_id, speed)
@@ -141,25 +173,79 @@ class MotorController:
         except Exception as e:
             self.logger.error(f"Error setting motor {motor_id} speed: {e}")
     
+    def queue_speed(self, motor_id: int, speed: int):
+        """
+        Queue a speed for a motor without touching the I2C bus
+        
+        Queued speeds are sent together by flush().
+        
+        Args:
+            motor_id: Motor number (1, 2, or 3)
+            speed: Speed from -800 to +800 (negative = reverse)
+        """
+        speed = self._prepare_speed(motor_id, speed)
+        if speed is not None:
+            self._pending[motor_id] = speed
+    
+    def flush(self):
+        """
+        Send all queued speeds
+        
+        With every motor enabled this is a single Motoron 'Set all speeds'
+        command; otherwise each queued enabled motor gets its own command so
+        disabled channels are never written.
+        """
+        pending = self._pending
+        if not pending:
+            return
+        
+        if not self._stop_all_at_once:
+            for motor_id in self._enabled_motor_ids:
+                if motor_id in pending:
+                    try:
+                        self.mc.set_speed(motor_id, pending[motor_id])
+                        self.current_speeds[motor_id] = pending[motor_id]
+                    except Exception as e:
+                        self.logger.error(f"Error setting motor {motor_id} speed: {e}")
+            pending.clear()
+            return
+        
+        # Motors without a queued speed keep their current speed
+        speeds = [pending.get(motor_id, self.current_speeds[motor_id]) for motor_id in self._motor_ids]
+        try:
+            self.mc.set_all_speeds(*speeds)
+            self.current_speeds.update(pending)
+        except Exception as e:
+            self.logger.error(f"Error setting motor speeds: {e}")
+        finally:
+            pending.clear()
+    
     def set_all_speeds(self, speeds: Dict[int, int]):
         """
         Set speeds for multiple motors at once
         
+        Speeds go out together through flush() (one I2C transaction when every
+        motor is enabled); disabled motors are never written and motors not in
+        speeds keep their speed.
+        
         Args:
             speeds: Dictionary mapping motor_id to speed
         """
         for motor_id, speed in speeds.items():
-            self.set_speed(motor_id, speed)
+            self.queue_speed(motor_id, speed)
+        self.flush()
     
-    def set_velocity(self, linear_speed: float, angular_speed: float):
+    def get_wheel_speeds(self, linear_speed: float, angular_speed: float) -> Dict[int, int]:
         """
-        Set robot velocity using differential drive kinematics
+        Convert a normalized velocity into per-motor speeds (differential drive)
         
         Args:
             linear_speed: Forward/backward speed (-1.0 to 1.0)
             angular_speed: Turning speed (-1.0 to 1.0, negative = left)
+            
+        Returns:
+            Dictionary mapping motor_id to motor speed for the left and right wheels
         """
-        # Only log if debug
         # Convert normalized speeds to motor speeds
         max_motor_speed = self.max_speed
         
@@ -173,48 +259,77 @@ class MotorController:
             left_speed /= max_abs_speed
             right_speed /= max_abs_speed
         
-        # Convert to motor speeds
-        left_motor_speed = int(left_speed * max_motor_speed)
-        right_motor_speed = int(right_speed * max_motor_speed)
-        
         # Use motor mapping configuration (Motor 2=Right, Motor 3=Left, Motor 1=Unused)
         left_motor_id = self.motor_mapping.get('left_motor', 3)   # Motor 3
         right_motor_id = self.motor_mapping.get('right_motor', 2) # Motor 2
         
-        # Only set speeds for enabled motors
-        if self.motor_enabled.get(left_motor_id, True):
-            self.set_speed(left_motor_id, left_motor_speed)
+        return {
+            left_motor_id: int(left_speed * max_motor_speed),
+            right_motor_id: int(right_speed * max_motor_speed)
+        }
+    
+    def set_velocity(self, linear_speed: float, angular_speed: float):
+        """
+        Set robot velocity using differential drive kinematics
         
-        if self.motor_enabled.get(right_motor_id, True):
-            self.set_speed(right_motor_id, right_motor_speed)
+        Args:
+            linear_speed: Forward/backward speed (-1.0 to 1.0)
+            angular_speed: Turning speed (-1.0 to 1.0, negative = left)
+        """
+        # Only log if debug
+        # Both wheels are sent together by flush(); disabled motors are dropped by
+        # queue_speed and never written
+        for motor_id, speed in self.get_wheel_speeds(linear_speed, angular_speed).items():
+            self.queue_speed(motor_id, speed)
+        self.flush()
         
         # Only log if debug
     
+    def _stop_enabled_motors(self, set_speed: Callable[[int, int], None]):
+        """
+        Send speed 0 to each enabled motor separately
+        
+        Only enabled motors are stopped, to avoid errors with disabled Motor 1,
+        and a failure on one motor does not keep the others running.
+        """
+        for motor_id in self._enabled_motor_ids:
+            try:
+                set_speed(motor_id, 0)
+                self.current_speeds[motor_id] = 0
+            except Exception as e:
+                self.logger.error(f"Error stopping motor {motor_id}: {e}")
+    
     def stop(self):
         """Stop all motors gradually (using deceleration limits)"""
+        self._pending.clear()
+        if not self._stop_all_at_once:
+            self._stop_enabled_motors(self.mc.set_speed)
+            return
         try:
-            # Only stop enabled motors
-            for motor_id in [1, 2, 3]:
-                if self.motor_enabled.get(motor_id, True):
-                    self.mc.set_speed(motor_id, 0)
-                    self.current_speeds[motor_id] = 0
+            # One 'Set all speeds' command stops every motor
+            self.mc.set_all_speeds(*self._stop_speeds)
+            self.current_speeds.update(self._stopped_speeds)
             # Only log on user request
         except Exception as e:
             self.logger.error(f"Error stopping motors: {e}")
+            self._stop_enabled_motors(self.mc.set_speed)
     
     def emergency_stop(self):
         """Emergency stop - immediate halt of all motors"""
         self.emergency_stop_active = True
-        try:
-            # Set speeds to zero immediately (bypasses acceleration/deceleration)
-            # Only stop enabled motors to avoid errors with disabled Motor 1
-            for motor_id in [1, 2, 3]:
-                if self.motor_enabled.get(motor_id, True):
-                    self.mc.set_speed(motor_id, 0)
-                    self.current_speeds[motor_id] = 0
-            self.logger.critical("EMERGENCY STOP - All motors halted")
-        except Exception as e:
-            self.logger.error(f"Error during emergency stop: {e}")
+        self._pending.clear()
+        # Set speeds to zero immediately (bypasses acceleration/deceleration)
+        if self._stop_all_at_once:
+            try:
+                # A single I2C command for all motors
+                self.mc.set_all_speeds_now(*self._stop_speeds)
+                self.current_speeds.update(self._stopped_speeds)
+            except Exception as e:
+                self.logger.error(f"Error during emergency stop: {e}")
+                self._stop_enabled_motors(self.mc.set_speed_now)
+        else:
+            self._stop_enabled_motors(self.mc.set_speed_now)
+        self.logger.critical("EMERGENCY STOP - All motors halted")
     
     def reset_emergency_stop(self):
         """Reset emergency stop condition"""
@@ -288,6 +403,16 @@ class MotorController:
             # Only log if debug
             return 0.0
     
+    def get_all_currents(self) -> Dict[int, float]:
+        """
+        Get processed current readings for all enabled motors
+        
+        Returns:
+            Dictionary mapping motor_id to current (raw processed units).
+            Disabled motors are not queried.
+        """
+        return {motor_id: self.get_motor_current(motor_id) for motor_id in self._enabled_motor_ids}
+    
     def test_motors(self):
         """Test routine to verify motor operation"""
         # Only log on user request
@@ -298,7 +423,7 @@ class MotorController:
         
         try:
             # Test each motor individually
-            for motor_id in [1, 2, 3]:
+            for motor_id in self._motor_ids:
                 # Only log on user request
                 
                 # Forward direction
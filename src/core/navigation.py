@@ -9,13 +9,15 @@ import time
 import math
 from typing import Dict, Any, Tuple, List, Optional, Callable
 
+logger = logging.getLogger(__name__)
+
 
 class NavigationSystem:
     """Autonomous navigation system"""
     
     def __init__(self, config: Dict[str, Any], hardware_manager):
         """Initialize navigation system"""
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.config = config
         self.hardware = hardware_manager
         
@@ -14,6 +14,8 @@ from .navigation import NavigationSystem
 from .communication import CommunicationManager
 from .safety import SafetySystem
 
+logger = logging.getLogger(__name__)
+
 
 class Robot:
     def self_test(self):
@@ -68,7 +70,7 @@ class Robot:
     
     def __init__(self, config):
         """Initialize the robot with configuration"""
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.config = config
         self.running = False
         
@@ -222,13 +224,11 @@ class Robot:
     def _handle_command(self, command: Dict[str, Any]):
         """Handle commands from communication system"""
         # {'type': 'move', 'data': {'speed': 400, 'direction': 0}}
-        self.logger.info(f"robot._handle_command: Received command: {command}")
+        self.logger.debug("robot._handle_command: Received command: %s", command)
         cmd_type = command.get('type')
-        self.logger.info(f"Command type: {cmd_type}")
         self._last_command = cmd_type  # Track last command for telemetry                
 
         if cmd_type == 'move':
-            self.logger.info(f"Handling move command: {command}")
             self._handle_move_command(command)
         elif cmd_type == 'state_change':
             # Handle both formats: {"type": "state_change", "state": "value"} and {"type": "state_change", "data": "value"}
@@ -244,17 +244,13 @@ class Robot:
     
     def _handle_move_command(self, command: Dict[str, Any]):
         """Handle movement commands"""
-        self.logger.info(f"_handle_move_command: Current state is {self.state_machine.current_state}")
-        
         if self.state_machine.current_state.value == 'manual_control':
             # Extract data from command - handle both formats for compatibility
             data = command.get('data', command)  # Use 'data' field if present, otherwise use command directly
             speed = data.get('speed', 0)
             direction = data.get('direction', 0)
-            self.logger.info(f"_handle_move_command: Extracted speed={speed}, direction={direction}")
-            self.logger.info(f"_handle_move_command: Calling motors.set_velocity({speed}, {direction})")
+            self.logger.debug("_handle_move_command: set_velocity(%s, %s)", speed, direction)
             self.hardware.motors.set_velocity(speed, direction)
-            self.logger.info(f"_handle_move_command: Motor command sent successfully")
         else:
             self.logger.warning(f"_handle_move_command: Cannot move in state '{self.state_machine.current_state}', need 'manual_control'")
     
@@ -8,13 +8,15 @@ import logging
 import time
 from typing import Dict, Any, Callable, Optional
 
+logger = logging.getLogger(__name__)
+
 
 class SafetySystem:
     """Robot safety monitoring and emergency response"""
     
     def __init__(self, config: Dict[str, Any], hardware_manager):
         """Initialize safety system"""
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.config = config
         self.hardware = hardware_manager
         
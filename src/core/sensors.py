@@ -9,13 +9,15 @@ import time
 import random
 from typing import Dict, Any
 
+logger = logging.getLogger(__name__)
+
 
 class SensorManager:
     """Manages robot's local sensors"""
     
     def __init__(self, config: Dict[str, Any]):
         """Initialize sensor manager"""
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.config = config
         
         # Sensor configuration
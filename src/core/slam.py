@@ -14,6 +14,8 @@ from collections import deque
 
 from .lidar import LidarScan
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class Pose:
@@ -30,7 +32,7 @@ class SLAMSystem:
     
     def __init__(self, config: Dict[str, Any], lidar_manager):
         """Initialize SLAM system"""
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.config = config
         self.lidar = lidar_manager
         
@@ -87,7 +89,7 @@ class SLAMSystem:
             self.logger.info("SLAM: Not mapping, scan ignored.")
             return
         try:
-            self.logger.info(f"SLAM: Processing scan with {len(scan.points) if scan and hasattr(scan, 'points') else 'N/A'} points.")
+            self.logger.info(f"SLAM: Processing scan with {scan.total_points if scan else 'N/A'} points.")
             # Update occupancy grid with scan data
             self._update_occupancy_grid(scan)
             self.total_scans_processed += 1
@@ -104,15 +106,14 @@ class SLAMSystem:
         robot_y = self.current_pose.y
         robot_theta = self.current_pose.theta
         
-        for point in scan.points:
-            if not point.valid or point.distance > self.max_range:
-                continue
-            
-            # Convert LiDAR point to world coordinates
-            point_angle = np.radians(point.angle) + robot_theta
-            point_x = robot_x + point.distance * np.cos(point_angle)
-            point_y = robot_y + point.distance * np.sin(point_angle)
-            
+        # Convert valid in-range LiDAR points to world coordinates in one pass
+        in_range = scan.valid & (scan.distances <= self.max_range)
+        distances = scan.distances[in_range].astype(np.float64)
+        point_angles = np.radians(scan.angles[in_range].astype(np.float64)) + robot_theta
+        points_x = robot_x + distances * np.cos(point_angles)
+        points_y = robot_y + distances * np.sin(point_angles)
+        
+        for point_x, point_y in zip(points_x.tolist(), points_y.tolist()):
             # Update occupancy grid along ray from robot to point
             self._update_ray(robot_x, robot_y, point_x, point_y)
     
@@ -9,6 +9,8 @@ import time
 from enum import Enum
 from typing import Dict, Any, Callable, Optional
 
+logger = logging.getLogger(__name__)
+
 
 class RobotState(Enum):
     """Available robot states"""
@@ -26,7 +28,7 @@ class StateMachine:
     
     def __init__(self, config: Dict[str, Any]):
         """Initialize state machine"""
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.config = config
         
         # Current state